@@ -13,7 +13,6 @@ Run from repo root:
   python3 config/data_generation/generator.py validate
 """
 
-import json
 import os
 import random
 import re
@@ -21,6 +20,11 @@ import sys
 import argparse
 from typing import Dict, List, Any, Optional
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "lib"))
+from dns_data import profiling
+from dns_data.jsonio import load_json
+from dns_data.writers import write_json_many
+
 # Level display name -> file suffix and ID prefix
 LEVEL_MAP = {
     "Beginner": ("beginner", "beginner"),
@@ -69,6 +73,11 @@ def get_level_prefix(args: argparse.Namespace) -> str:
     return getattr(args, "level_prefix", None) or os.environ.get("LEVEL_FILE_PREFIX", DEFAULT_LEVEL_PREFIX)
 
 
+def report_writes(written: Dict[str, bool]) -> None:
+    for path, changed in written.items():
+        print(f"{'Wrote' if changed else 'Unchanged'} {path}")
+
+
 # ---------------------------------------------------------------------------
 # build-master: read level files → vocabulary_master.json, grammar_master.json
 # ---------------------------------------------------------------------------
@@ -81,6 +90,7 @@ def extract_word_from_explanation(explanation: str) -> Optional[str]:
     return m.group(1).strip() if m else None
 
 
+@profiling.profiled()
 def build_master(output_dir: str, sources_dir: str, level_prefix: str) -> None:
     os.makedirs(sources_dir, exist_ok=True)
     vocabulary_master: Dict[str, List[Dict]] = {level: [] for level in DATA_LEVELS}
@@ -92,8 +102,7 @@ def build_master(output_dir: str, sources_dir: str, level_prefix: str) -> None:
         path = os.path.join(output_dir, f"{level_prefix}_{suffix}.json")
         if not os.path.isfile(path):
             continue
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = load_json(path)
         # Flashcards → vocabulary_master
         for card in data.get("flashcards", []):
             word = (card.get("front") or "").strip()
@@ -123,30 +132,25 @@ def build_master(output_dir: str, sources_dir: str, level_prefix: str) -> None:
                     "category": "listening",
                 })
 
+    profiling.count(sum(len(v) for v in vocabulary_master.values()))
     vocab_path = os.path.join(sources_dir, "vocabulary_master.json")
-    with open(vocab_path, "w", encoding="utf-8") as f:
-        json.dump(vocabulary_master, f, indent=2, ensure_ascii=False)
-    print(f"Wrote {vocab_path}")
-
     grammar_path = os.path.join(sources_dir, "grammar_master.json")
-    with open(grammar_path, "w", encoding="utf-8") as f:
-        json.dump(grammar_master, f, indent=2, ensure_ascii=False)
-    print(f"Wrote {grammar_path}")
+    report_writes(write_json_many({vocab_path: vocabulary_master, grammar_path: grammar_master}))
 
 
 # ---------------------------------------------------------------------------
 # generate: vocabulary_master + grammar_master → level files + practice.json
 # ---------------------------------------------------------------------------
 
-def make_options(correct: str, all_meanings: List[str], k: int = 4) -> List[str]:
+def make_options(correct: str, all_meanings: List[str], k: int = 4, rng: random.Random = random) -> List[str]:
     """Build 4 options with correct answer; shuffle others from all_meanings."""
     others = [m for m in all_meanings if m != correct]
     opts = [correct]
     if len(others) >= k - 1:
-        opts.extend(random.sample(others, k - 1))
+        opts.extend(rng.sample(others, k - 1))
     else:
         opts.extend(others)
-    random.shuffle(opts)
+    rng.shuffle(opts)
     return opts
 
 
@@ -159,6 +163,8 @@ def generate_level(
     short = level_short(level)
     suffix = level_file_suffix(level)
     all_meanings = [v["meaning"] for v in vocab_list]
+    # Seeded per level so unchanged sources regenerate byte-identical files.
+    rng = random.Random(f"{level_prefix}:{level}")
 
     # Flashcards
     flashcards = []
@@ -184,8 +190,8 @@ def generate_level(
     for i, v in enumerate(vocab_list, 1):
         word = v["word"]
         meaning = v["meaning"]
-        opts_v = make_options(meaning, all_meanings)
-        opts_l = make_options(meaning, all_meanings)
+        opts_v = make_options(meaning, all_meanings, rng=rng)
+        opts_l = make_options(meaning, all_meanings, rng=rng)
         cat = (v.get("category") or "general").replace(" ", "_")
         # Vocabulary question
         practice.append({
@@ -235,8 +241,7 @@ def merge_existing_grammar_and_extra_practice(
     path = os.path.join(output_dir, f"{level_prefix}_{suffix}.json")
     if not os.path.isfile(path):
         return
-    with open(path, "r", encoding="utf-8") as f:
-        existing = json.load(f)
+    existing = load_json(path)
     # Keep existing grammar if we didn't load any from master
     if not generated.get("grammar") and existing.get("grammar"):
         generated["grammar"] = existing["grammar"]
@@ -248,6 +253,7 @@ def merge_existing_grammar_and_extra_practice(
             generated["practice"].append(p)
 
 
+@profiling.profiled()
 def generate(
     output_dir: str,
     sources_dir: str,
@@ -259,12 +265,8 @@ def generate(
     if not os.path.isfile(vocab_path):
         print(f"Missing {vocab_path}. Run: build-master", file=sys.stderr)
         sys.exit(1)
-    with open(vocab_path, "r", encoding="utf-8") as f:
-        vocabulary_master = json.load(f)
-    grammar_master = {}
-    if os.path.isfile(grammar_path):
-        with open(grammar_path, "r", encoding="utf-8") as f:
-            grammar_master = json.load(f)
+    vocabulary_master = load_json(vocab_path)
+    grammar_master = load_json(grammar_path) if os.path.isfile(grammar_path) else {}
 
     os.makedirs(output_dir, exist_ok=True)
 
@@ -273,18 +275,17 @@ def generate(
         "description": "Practice questions organized by level and category",
         "levels": {},
     }
+    outputs: Dict[str, Any] = {}
 
     for level in DATA_LEVELS:
         vocab_list = vocabulary_master.get(level, [])
         grammar_list = grammar_master.get(level, [])
+        profiling.count(len(vocab_list))
         payload = generate_level(level, vocab_list, grammar_list, level_prefix)
         if merge_with_existing:
             merge_existing_grammar_and_extra_practice(payload, output_dir, level_prefix, level)
         suffix = level_file_suffix(level)
-        out_path = os.path.join(output_dir, f"{level_prefix}_{suffix}.json")
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(payload, f, indent=2, ensure_ascii=False)
-        print(f"Wrote {out_path}")
+        outputs[os.path.join(output_dir, f"{level_prefix}_{suffix}.json")] = payload
 
         # practice.json levels: beginner.vocabulary, beginner.grammar, beginner.listening
         lev_key = suffix.lower()
@@ -294,16 +295,16 @@ def generate(
             "listening": [p for p in payload["practice"] if (p.get("category") or "").lower() == "listening"],
         }
 
-    practice_path = os.path.join(output_dir, "practice.json")
-    with open(practice_path, "w", encoding="utf-8") as f:
-        json.dump(practice_aggregate, f, indent=2, ensure_ascii=False)
-    print(f"Wrote {practice_path}")
+    outputs[os.path.join(output_dir, "practice.json")] = practice_aggregate
+    # Every level file is read (merge) above before any is replaced.
+    report_writes(write_json_many(outputs))
 
 
 # ---------------------------------------------------------------------------
 # validate
 # ---------------------------------------------------------------------------
 
+@profiling.profiled()
 def validate(output_dir: str, level_prefix: str, schema_path: str) -> bool:
     try:
         import jsonschema
@@ -312,16 +313,14 @@ def validate(output_dir: str, level_prefix: str, schema_path: str) -> bool:
         return True
     if not os.path.isfile(schema_path):
         return True
-    with open(schema_path, "r", encoding="utf-8") as f:
-        schema = json.load(f)
+    schema = load_json(schema_path)
     ok = True
     for level in DATA_LEVELS:
         suffix = level_file_suffix(level)
         path = os.path.join(output_dir, f"{level_prefix}_{suffix}.json")
         if not os.path.isfile(path):
             continue
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = load_json(path)
         try:
             jsonschema.validate(data, schema)
             print(f"Valid: {path}")
@@ -343,7 +342,9 @@ def main() -> None:
     parser.add_argument("--level-prefix", default=os.environ.get("LEVEL_FILE_PREFIX", DEFAULT_LEVEL_PREFIX), help="Level file prefix")
     parser.add_argument("--no-merge", action="store_true", help="Do not merge existing grammar/grammar practice into generate")
     parser.add_argument("--schema", default=os.environ.get("SCHEMA_FILE"), help="Schema file for validate")
+    profiling.add_arguments(parser)
     args = parser.parse_args()
+    profiling.configure(args, f"generator-{args.command}")
 
     workspace = get_workspace_root()
     output_dir = get_output_dir(args)
@@ -0,0 +1,7 @@
+"""
+Shared Python helpers for the data packs (nplearning, sanskritlearning,
+educa_data, spicebite_data).
+
+Toolkit scripts put .dns_system_language/lib on sys.path (shell wrappers use
+PYTHONPATH) and import from here instead of re-implementing the same logic.
+"""
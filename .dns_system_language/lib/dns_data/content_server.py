@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Local content server for a data pack, standing in for the apps' base_url.
+
+Serves a pack directory over HTTP/1.1 with keep-alive and the behaviour the
+sync client relies on from a CDN:
+- ETag (sha256 of the file) and If-None-Match → 304 Not Modified
+- gzip Content-Encoding when the client accepts it
+- single byte ranges (Range / If-Range → 206 Partial Content)
+--latency-ms adds a fixed delay per response to mimic a mobile round trip.
+
+Usage:
+  python3 -m dns_data.content_server educa_data --port 8765
+  python3 -m dns_data.sync_client sync http://127.0.0.1:8765 /tmp/educa
+"""
+
+import argparse
+import gzip
+import hashlib
+import os
+import posixpath
+import re
+import threading
+import time
+import urllib.parse
+from email.utils import formatdate
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+GZIP_MIN_BYTES = 512
+GZIP_TYPES = (".json", ".csv", ".txt", ".md")
+RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)\Z")
+
+
+class FileCache:
+    """File contents, sha256 and gzip body, reused while mtime and size are unchanged."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries: dict[str, tuple[tuple[int, int], bytes, str, Optional[bytes]]] = {}
+
+    def get(self, path: str) -> tuple[bytes, str, Optional[bytes], float]:
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self.lock:
+            known = self.entries.get(path)
+        if known and known[0] == stamp:
+            return known[1], known[2], known[3], st.st_mtime
+        with open(path, "rb") as f:
+            body = f.read()
+        digest = hashlib.sha256(body).hexdigest()
+        gz = None
+        if len(body) >= GZIP_MIN_BYTES and path.endswith(GZIP_TYPES):
+            gz = gzip.compress(body, compresslevel=6, mtime=0)
+        with self.lock:
+            self.entries[path] = (stamp, body, digest, gz)
+        return body, digest, gz, st.st_mtime
+
+
+def parse_range(header: str, size: int) -> Optional[tuple[int, int]]:
+    """(start, end inclusive) for a single "bytes=" range; None when absent or multi-range.
+
+    Raises ValueError when the range cannot be satisfied.
+    """
+    m = RANGE_RE.match(header.strip())
+    if not m:
+        return None
+    first, last = m.group(1), m.group(2)
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError(header)
+    return start, end
+
+
+def etag_matches(header: str, tags: tuple[str, ...]) -> bool:
+    candidates = [t.strip() for t in header.split(",")]
+    return "*" in candidates or any(t.removeprefix("W/") in tags for t in candidates)
+
+
+class PackRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "dns-data-content/1.0"
+
+    # Set on the subclass made by make_server().
+    root: str = "."
+    cache: FileCache
+    latency: float = 0.0
+    quiet: bool = True
+
+    def log_message(self, format: str, *args) -> None:
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def resolve(self) -> Optional[str]:
+        rel = urllib.parse.unquote(urllib.parse.urlsplit(self.path).path)
+        rel = posixpath.normpath(rel).lstrip("/")
+        if rel.startswith("..") or rel in ("", "."):
+            return None
+        path = os.path.join(self.root, *rel.split("/"))
+        return path if os.path.isfile(path) else None
+
+    def send_body(self, status: int, headers: dict[str, str], body: bytes, head_only: bool) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(body)
+
+    def do_HEAD(self) -> None:
+        self.handle_get(head_only=True)
+
+    def do_GET(self) -> None:
+        self.handle_get(head_only=False)
+
+    def handle_get(self, head_only: bool) -> None:
+        path = self.resolve()
+        if path is None:
+            self.send_body(HTTPStatus.NOT_FOUND, {"Content-Type": "text/plain"}, b"not found\n", head_only)
+            return
+        body, digest, gz, mtime = self.cache.get(path)
+        etag, gz_etag = f'"{digest}"', f'"{digest}-gz"'
+        headers = {
+            "Content-Type": "application/json" if path.endswith(".json") else "application/octet-stream",
+            "Last-Modified": formatdate(mtime, usegmt=True),
+            "Accept-Ranges": "bytes",
+            "Cache-Control": "no-cache",
+        }
+        if gz is not None:
+            headers["Vary"] = "Accept-Encoding"
+
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match and etag_matches(if_none_match, (etag, gz_etag)):
+            headers["ETag"] = etag
+            self.send_body(HTTPStatus.NOT_MODIFIED, headers, b"", head_only=True)
+            return
+
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if range_header and (not if_range or if_range.strip() == etag):
+            try:
+                span = parse_range(range_header, len(body))
+            except ValueError:
+                headers["Content-Range"] = f"bytes */{len(body)}"
+                self.send_body(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE, headers, b"", head_only)
+                return
+            if span is not None:
+                start, end = span
+                headers["ETag"] = etag
+                headers["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+                self.send_body(HTTPStatus.PARTIAL_CONTENT, headers, body[start:end + 1], head_only)
+                return
+
+        accepts_gzip = "gzip" in (self.headers.get("Accept-Encoding") or "")
+        if gz is not None and accepts_gzip:
+            headers["ETag"] = gz_etag
+            headers["Content-Encoding"] = "gzip"
+            self.send_body(HTTPStatus.OK, headers, gz, head_only)
+        else:
+            headers["ETag"] = etag
+            self.send_body(HTTPStatus.OK, headers, body, head_only)
+
+
+def make_server(root: str, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0.0, quiet: bool = True) -> ThreadingHTTPServer:
+    """Server for root; port 0 picks a free port (see server.server_address)."""
+    handler = type(
+        "BoundPackRequestHandler",
+        (PackRequestHandler,),
+        {"root": os.path.abspath(root), "cache": FileCache(), "latency": latency_ms / 1000.0, "quiet": quiet},
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve a data pack like its base_url (gzip, ETag, Range)")
+    parser.add_argument("pack_dir", help="Pack directory containing manifest.json")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every response")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    server = make_server(args.pack_dir, args.host, args.port, args.latency_ms, quiet=not args.verbose)
+    host, port = server.server_address[:2]
+    print(f"Serving {os.path.abspath(args.pack_dir)} at http://{host}:{port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Precomputed facet indexes for data packs.
+
+For every file configured under "facets" in a pack's manifest.json, builds an
+inverted index (facet value → item offsets) plus per-value counts and writes it
+as a sidecar file under data/index/. The manifest entry of the source file gets
+a "facet_index" reference, so apps can list facets and filter in O(result)
+instead of scanning the whole dataset.
+
+Manifest config:
+  "facets": {
+    "restaurants_global": {"fields": ["country", "city", "cuisineType"]},
+    "jobs": {"fields": [{"name": "country", "field": "location", "split": ",", "part": -1}]}
+  }
+
+Usage:
+  python3 -m dns_data.facets spicebite_data
+  python3 -m dns_data.facets educa_data --check
+"""
+
+import argparse
+import json
+import os
+import sys
+from dataclasses import dataclass
+from typing import Iterable, Optional, Union
+
+from dns_data.writers import file_sha256, write_json
+
+INDEX_VERSION = 1
+INDEX_DIR = os.path.join("data", "index")
+
+
+@dataclass
+class FacetField:
+    """A facet: output name, source field and optional "a, b, c" split."""
+
+    name: str
+    field: str
+    split: Optional[str] = None
+    part: Optional[int] = None
+
+    @classmethod
+    def parse(cls, spec: Union[str, dict]) -> "FacetField":
+        if isinstance(spec, str):
+            return cls(spec, spec)
+        field = spec["field"]
+        return cls(spec.get("name", field), field, spec.get("split"), spec.get("part"))
+
+    def values(self, item: dict) -> list[str]:
+        raw = item.get(self.field)
+        raw_values = raw if isinstance(raw, list) else [raw]
+        out = []
+        for value in raw_values:
+            if value is None or isinstance(value, (dict, list)):
+                continue
+            if isinstance(value, bool):
+                value = "true" if value else "false"
+            value = str(value)
+            if self.split:
+                pieces = [p.strip() for p in value.split(self.split)]
+                if self.part is not None:
+                    pieces = pieces[self.part:][:1]
+            else:
+                pieces = [value.strip()]
+            out.extend(p for p in pieces if p)
+        # One item may list a value twice; it is still one match.
+        return list(dict.fromkeys(out))
+
+
+def find_array_key(data: dict, preferred: Optional[str] = None) -> Optional[str]:
+    if preferred and isinstance(data.get(preferred), list):
+        return preferred
+    for key in data:
+        if isinstance(data[key], list):
+            return key
+    return None
+
+
+def build_facet_index(items: list[dict], fields: Iterable[FacetField], id_field: str = "id") -> dict:
+    """Inverted index {facet: {value: {"count", "offsets"}}} ordered by count."""
+    facets = {}
+    for facet in fields:
+        postings: dict[str, list[int]] = {}
+        for offset, item in enumerate(items):
+            if not isinstance(item, dict):
+                continue
+            for value in facet.values(item):
+                postings.setdefault(value, []).append(offset)
+        ordered = sorted(postings.items(), key=lambda kv: (-len(kv[1]), kv[0]))
+        facets[facet.name] = {value: {"count": len(offs), "offsets": offs} for value, offs in ordered}
+    return {
+        "item_count": len(items),
+        "ids": [item.get(id_field) if isinstance(item, dict) else None for item in items],
+        "facets": facets,
+    }
+
+
+def build_pack_indexes(pack_dir: str, manifest_name: str = "manifest.json") -> list[str]:
+    """Build every configured index of a pack and reference it from the manifest."""
+    manifest_path = os.path.join(pack_dir, manifest_name)
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    written = []
+    for key, config in manifest.get("facets", {}).items():
+        entry = manifest.get("files", {}).get(key)
+        if not entry:
+            print(f"⚠️  facets.{key}: no matching entry in manifest files", file=sys.stderr)
+            continue
+        source_rel = entry.get("path") or entry.get("filename") or key
+        source_path = os.path.join(pack_dir, source_rel)
+        with open(source_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        array_key = find_array_key(data, config.get("array"))
+        if array_key is None:
+            print(f"⚠️  {source_rel}: no data array found", file=sys.stderr)
+            continue
+        fields = [FacetField.parse(spec) for spec in config.get("fields", [])]
+
+        index = {
+            "version": INDEX_VERSION,
+            "source": source_rel,
+            "source_hash": file_sha256(source_path),
+            "array": array_key,
+        }
+        index.update(build_facet_index(data[array_key], fields, config.get("id_field", "id")))
+
+        index_rel = os.path.join(INDEX_DIR, f"{key}.facets.json").replace(os.sep, "/")
+        index_path = os.path.join(pack_dir, index_rel)
+        write_json(index_path, index, indent=None, separators=(",", ":"))
+
+        entry["facet_index"] = {
+            "path": index_rel,
+            "fields": [facet.name for facet in fields],
+            "size": os.path.getsize(index_path),
+            "hash": file_sha256(index_path),
+        }
+        written.append(index_rel)
+
+    write_json(manifest_path, manifest, newline=True)
+    return written
+
+
+def stale_indexes(pack_dir: str, manifest_name: str = "manifest.json") -> list[str]:
+    """Configured indexes that are missing or were built from other source content."""
+    with open(os.path.join(pack_dir, manifest_name), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    stale = []
+    for key in manifest.get("facets", {}):
+        entry = manifest.get("files", {}).get(key, {})
+        ref = entry.get("facet_index")
+        index_path = os.path.join(pack_dir, ref["path"]) if ref else None
+        if not index_path or not os.path.isfile(index_path):
+            stale.append(key)
+            continue
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        source_path = os.path.join(pack_dir, index.get("source", ""))
+        if not os.path.isfile(source_path) or file_sha256(source_path) != index.get("source_hash"):
+            stale.append(key)
+    return stale
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build facet indexes for a data pack")
+    parser.add_argument("pack_dir", help="Pack directory containing manifest.json")
+    parser.add_argument("--check", action="store_true", help="Only report missing or stale indexes")
+    args = parser.parse_args()
+
+    if args.check:
+        stale = stale_indexes(args.pack_dir)
+        for key in stale:
+            print(f"❌ {key}: facet index missing or stale")
+        if not stale:
+            print("✅ Facet indexes up to date")
+        return 1 if stale else 0
+
+    for path in build_pack_indexes(args.pack_dir):
+        print(f"Wrote {os.path.join(args.pack_dir, path)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Shared JSON loader for toolkit scripts.
+
+- Parses with orjson or ujson when installed, the stdlib json module otherwise
+  (DNS_JSON_BACKEND=json forces the stdlib). Invalid documents always raise
+  json.JSONDecodeError, and stdlib-only input (NaN, Infinity) still loads.
+- Parsed documents are memoised per process, keyed by path, mtime and size,
+  so a file read by several steps of one run is parsed once. The memoised
+  object is shared: pass memo=False when the caller mutates the result.
+- Files of at least DNS_JSON_CACHE_MIN_BYTES (default 256 KiB) also get an
+  on-disk parsed cache (marshal) under DNS_JSON_CACHE. The disk cache is on
+  by default only with the stdlib backend; orjson already parses about as
+  fast as marshal loads. Set DNS_JSON_CACHE=0 to disable it.
+
+Usage:
+  from dns_data.jsonio import load_json
+  data = load_json("educa_data/data/jobs.json")
+
+  python3 -m dns_data.jsonio count educa_data/data/*.json   # "<file>\\t<items>"
+"""
+
+import argparse
+import hashlib
+import json
+import marshal
+import os
+import sys
+import tempfile
+import threading
+from typing import Any, Optional
+
+_backend = os.environ.get("DNS_JSON_BACKEND", "").lower()
+_fast_loads = None
+if _backend in ("", "orjson"):
+    try:
+        import orjson
+
+        _fast_loads, BACKEND = orjson.loads, "orjson"
+    except ImportError:
+        pass
+if _fast_loads is None and _backend in ("", "orjson", "ujson"):
+    try:
+        import ujson
+
+        _fast_loads, BACKEND = ujson.loads, "ujson"
+    except ImportError:
+        pass
+if _fast_loads is None:
+    BACKEND = "json"
+
+CACHE_MIN_BYTES = int(os.environ.get("DNS_JSON_CACHE_MIN_BYTES", 256 * 1024))
+# Stamp stored with each cached document; marshal output is specific to the interpreter.
+_CACHE_FORMAT = ("dns_data.jsonio", 1, marshal.version, sys.version_info[:2])
+
+_MISSING = object()
+_memo: dict[str, tuple[int, int, Any]] = {}
+_memo_lock = threading.Lock()
+
+
+def default_cache_dir() -> Optional[str]:
+    setting = os.environ.get("DNS_JSON_CACHE")
+    if setting in ("0", "false", "off"):
+        return None
+    if setting:
+        return setting
+    if BACKEND != "json":
+        return None
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "dns_data", "json")
+
+
+CACHE_DIR = default_cache_dir()
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse a JSON document with the fastest available backend."""
+    if _fast_loads is not None:
+        try:
+            return _fast_loads(data)
+        except ValueError:
+            # Re-parse with the stdlib: accepts NaN/Infinity, otherwise raises a proper JSONDecodeError.
+            pass
+    if isinstance(data, bytes):
+        data = data.decode("utf-8-sig")
+    return json.loads(data)
+
+
+def _cache_path(cache_dir: str, path: str) -> str:
+    return os.path.join(cache_dir, hashlib.sha1(path.encode("utf-8")).hexdigest() + ".marshal")
+
+
+def _read_cache(cache_file: str, stamp: tuple) -> Any:
+    """Cached document for stamp, or raises LookupError."""
+    try:
+        with open(cache_file, "rb") as f:
+            cached_stamp, value = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError) as e:
+        raise LookupError(cache_file) from e
+    if cached_stamp != stamp:
+        raise LookupError(cache_file)
+    return value
+
+
+def _write_cache(cache_file: str, stamp: tuple, value: Any) -> None:
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(cache_file), prefix=".jsonio.")
+        with os.fdopen(fd, "wb") as f:
+            f.write(marshal.dumps((stamp, value)))
+        os.replace(tmp, cache_file)
+    except (OSError, ValueError):
+        # A read-only or full cache dir only costs speed.
+        pass
+
+
+def load_json(path: str | os.PathLike, memo: bool = True, cache_dir: Optional[str] = CACHE_DIR) -> Any:
+    """Parse a JSON file, reusing an earlier parse while its mtime and size are unchanged."""
+    path = os.path.abspath(os.fspath(path))
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    if memo:
+        with _memo_lock:
+            known = _memo.get(path)
+        if known and known[:2] == key:
+            return known[2]
+
+    stamp = _CACHE_FORMAT + key
+    cache_file = _cache_path(cache_dir, path) if cache_dir and st.st_size >= CACHE_MIN_BYTES else None
+    value = _MISSING
+    if cache_file:
+        try:
+            value = _read_cache(cache_file, stamp)
+        except LookupError:
+            pass
+    if value is _MISSING:
+        with open(path, "rb") as f:
+            value = loads(f.read())
+        if cache_file:
+            _write_cache(cache_file, stamp, value)
+
+    if memo:
+        with _memo_lock:
+            _memo[path] = (key[0], key[1], value)
+    return value
+
+
+def forget(path: Optional[str | os.PathLike] = None) -> None:
+    """Drop one file (or everything) from the in-process memo."""
+    with _memo_lock:
+        if path is None:
+            _memo.clear()
+        else:
+            _memo.pop(os.path.abspath(os.fspath(path)), None)
+
+
+def count_items(data: Any) -> int:
+    """Length of the first top-level array (the item list of a data file)."""
+    if isinstance(data, list):
+        return len(data)
+    if isinstance(data, dict):
+        for value in data.values():
+            if isinstance(value, list):
+                return len(value)
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Shared JSON loader utilities")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_count = sub.add_parser("count", help="Print item counts of data files (0 when unreadable)")
+    p_count.add_argument("files", nargs="+")
+    args = parser.parse_args()
+
+    if args.command == "count":
+        for path in args.files:
+            try:
+                n = count_items(load_json(path))
+            except (OSError, ValueError):
+                n = 0
+            print(f"{path}\t{n}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
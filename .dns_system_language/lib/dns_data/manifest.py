@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Refresh size and hash of every file listed in a pack's manifest.json.
+
+Handles both manifest shapes used in this repo: entries with a "path"
+(educa_data, spicebite_data) and entries keyed by filename (nplearning,
+sanskritlearning). Entries whose file is missing are left untouched.
+
+Usage:
+  python3 -m dns_data.manifest educa_data
+"""
+
+import argparse
+import json
+import os
+
+from dns_data.writers import file_sha256, write_json
+
+
+def entry_path(pack_dir: str, key: str, entry: dict) -> str:
+    return os.path.join(pack_dir, entry.get("path") or entry.get("filename") or key)
+
+
+def refresh_manifest(pack_dir: str, manifest_name: str = "manifest.json") -> int:
+    """Update size/hash in place; returns the number of entries that changed."""
+    manifest_path = os.path.join(pack_dir, manifest_name)
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    changed = 0
+    for key, entry in manifest.get("files", {}).items():
+        path = entry_path(pack_dir, key, entry)
+        if not os.path.isfile(path):
+            continue
+        size, digest = os.path.getsize(path), file_sha256(path)
+        if entry.get("size") != size or entry.get("hash") != digest:
+            entry["size"] = size
+            entry["hash"] = digest
+            changed += 1
+
+    if changed:
+        write_json(manifest_path, manifest, newline=True)
+    return changed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Refresh manifest file sizes and hashes")
+    parser.add_argument("pack_dir", help="Pack directory containing manifest.json")
+    args = parser.parse_args()
+
+    changed = refresh_manifest(args.pack_dir)
+    print(f"Updated {changed} manifest entr{'y' if changed == 1 else 'ies'} in {args.pack_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Data-pipeline runner: a DAG of cached stages across all data packs.
+
+Stages are declared in config/pipeline.json with the command to run and the
+files it reads (inputs) and writes (outputs); paths and globs are relative to
+the repo root. Dependencies are inferred from declaration order: a stage waits
+for every earlier stage that writes a file it reads or writes, or reads a file
+it writes; "after" adds explicit dependencies (e.g. on a validation stage that
+writes nothing), so a failed validation blocks the stages that publish data.
+Independent stages run in parallel.
+
+A stage is skipped when its command and the content hashes of its inputs and
+outputs match the last successful run recorded in the stage cache. Files that
+a later stage rewrites as well (a pack's manifest.json) only count for the
+last writer. A stage that reads configuration out of such a file lists it as an
+input "path#key" (e.g. "educa_data/manifest.json#facets"): that top-level key
+always counts towards its fingerprint. Stages marked "manual" (e.g. network
+fetches) only run when named explicitly. A failing "advisory" stage (a check
+whose data is known to have open errors) is reported as a warning and blocks
+nothing unless --strict is given.
+
+Usage:
+  python3 -m dns_data.pipeline                    # everything that changed
+  python3 -m dns_data.pipeline educa spicebite    # stages by name prefix
+  python3 -m dns_data.pipeline --force --jobs 8
+  python3 -m dns_data.pipeline --strict            # advisory checks gate too
+  python3 -m dns_data.pipeline --list
+  python3 -m dns_data.pipeline --profile traces/   # per-stage Chrome traces
+"""
+
+import argparse
+import functools
+import glob
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Optional
+
+from dns_data import profiling
+from dns_data.writers import file_sha256
+
+LIB_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DNS_SYSTEM = os.path.dirname(LIB_DIR)
+WORKSPACE_ROOT = os.path.dirname(DNS_SYSTEM)
+DEFAULT_CONFIG = os.path.join(DNS_SYSTEM, "config", "pipeline.json")
+DEFAULT_CACHE = os.path.join(DNS_SYSTEM, ".pipeline_cache.json")
+
+
+@dataclass
+class Stage:
+    name: str
+    cmd: list[str]
+    inputs: list[str] = field(default_factory=list)
+    outputs: list[str] = field(default_factory=list)
+    manual: bool = False
+    advisory: bool = False
+    after: list[str] = field(default_factory=list)
+    deps: set[str] = field(default_factory=set)
+    # Outputs of later stages that also touch our files (e.g. a shared manifest.json).
+    shadowed: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_config(cls, spec: dict) -> "Stage":
+        return cls(
+            name=spec["name"],
+            cmd=list(spec["cmd"]),
+            inputs=list(spec.get("inputs", [])),
+            outputs=list(spec.get("outputs", [])),
+            manual=bool(spec.get("manual", False)),
+            advisory=bool(spec.get("advisory", False)),
+            after=list(spec.get("after", [])),
+        )
+
+    @property
+    def input_paths(self) -> list[str]:
+        return [split_section(p)[0] for p in self.inputs]
+
+    @property
+    def sections(self) -> list[str]:
+        return [p for p in self.inputs if split_section(p)[1] is not None]
+
+
+def split_section(spec: str) -> tuple[str, Optional[str]]:
+    """"file.json#key" → ("file.json", "key"); plain paths have no section."""
+    path, sep, key = spec.partition("#")
+    return path, (key if sep else None)
+
+
+def expand(root: str, patterns: list[str]) -> list[str]:
+    """Existing files matching the patterns, as sorted root-relative paths."""
+    found = set()
+    for pattern in patterns:
+        for path in glob.glob(os.path.join(root, pattern), recursive=True):
+            if os.path.isfile(path):
+                found.add(os.path.relpath(path, root).replace(os.sep, "/"))
+    return sorted(found)
+
+
+def is_pattern(path: str) -> bool:
+    return any(ch in path for ch in "*?[")
+
+
+@functools.lru_cache(maxsize=None)
+def pattern_regex(pattern: str) -> "re.Pattern[str]":
+    """Glob → regex where "*" stays within one path segment and "**" spans several."""
+    parts = re.split(r"(\*\*/?|\*|\?)", pattern)
+    regex = []
+    for part in parts:
+        if part in ("**", "**/"):
+            regex.append(".*")
+        elif part == "*":
+            regex.append("[^/]*")
+        elif part == "?":
+            regex.append("[^/]")
+        else:
+            regex.append(re.escape(part))
+    return re.compile("".join(regex) + r"\Z")
+
+
+def matches(path: str, pattern: str) -> bool:
+    return bool(pattern_regex(pattern).match(path))
+
+
+def overlaps(root: str, a: list[str], b: list[str]) -> bool:
+    """True when two pattern lists can refer to a common file."""
+    for p in a:
+        for q in b:
+            if p == q or (not is_pattern(p) and matches(p, q)) or (not is_pattern(q) and matches(q, p)):
+                return True
+    return bool(set(expand(root, a)) & set(expand(root, b)))
+
+
+def plan(root: str, stages: list[Stage]) -> None:
+    """Fill in deps from "after" and read/write hazards against earlier stages, and shadowed outputs."""
+    for i, stage in enumerate(stages):
+        touched = stage.input_paths + stage.outputs
+        stage.deps.update(stage.after)
+        for earlier in stages[:i]:
+            if overlaps(root, earlier.outputs, touched) or overlaps(root, earlier.input_paths, stage.outputs):
+                stage.deps.add(earlier.name)
+        for later in stages[i + 1:]:
+            if overlaps(root, later.outputs, touched):
+                stage.shadowed.extend(later.outputs)
+
+
+class StageCache:
+    """Persistent record of each stage's last successful run, plus file hashes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.data = {"stages": {}, "files": {}}
+        if os.path.isfile(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.data = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                pass
+
+    def file_hash(self, root: str, rel: str) -> str:
+        """sha256 of a file, reused while its mtime and size are unchanged."""
+        path = os.path.join(root, rel)
+        st = os.stat(path)
+        stamp = [st.st_mtime_ns, st.st_size]
+        with self.lock:
+            known = self.data["files"].get(rel)
+        if known and known["stamp"] == stamp:
+            return known["sha256"]
+        digest = file_sha256(path)
+        with self.lock:
+            self.data["files"][rel] = {"stamp": stamp, "sha256": digest}
+        return digest
+
+    def section_hash(self, root: str, spec: str) -> str:
+        """sha256 of one top-level key of a JSON file ("" when the file or key is missing)."""
+        rel, key = split_section(spec)
+        try:
+            with open(os.path.join(root, rel), "r", encoding="utf-8") as f:
+                value = json.load(f)[key]
+        except (OSError, ValueError, KeyError, TypeError):
+            return ""
+        return hashlib.sha256(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def fingerprint(self, root: str, stage: Stage) -> str:
+        # Files a later stage rewrites are left out, or the two would invalidate each other;
+        # "path#key" sections of such files still count.
+        files = [
+            rel for rel in expand(root, stage.input_paths + stage.outputs)
+            if not any(matches(rel, pattern) for pattern in stage.shadowed)
+        ]
+        payload = {
+            "cmd": stage.cmd,
+            "inputs": stage.inputs,
+            "outputs": stage.outputs,
+            "files": {rel: self.file_hash(root, rel) for rel in files},
+            "sections": {spec: self.section_hash(root, spec) for spec in stage.sections},
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def is_fresh(self, root: str, stage: Stage) -> bool:
+        with self.lock:
+            recorded = self.data["stages"].get(stage.name)
+        return bool(recorded) and recorded == self.fingerprint(root, stage)
+
+    def record(self, root: str, stage: Stage) -> None:
+        # Fingerprint after the run: in-place stages (manifest, index) change their own inputs.
+        fingerprint = self.fingerprint(root, stage)
+        with self.lock:
+            self.data["stages"][stage.name] = fingerprint
+            self.save()
+
+    def save(self) -> None:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path), prefix=".pipeline_cache.")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self.data, f)
+        os.replace(tmp, self.path)
+
+
+def load_stages(config_path: str) -> list[Stage]:
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    stages = [Stage.from_config(spec) for spec in config.get("stages", [])]
+    names = [s.name for s in stages]
+    if len(names) != len(set(names)):
+        raise ValueError(f"Duplicate stage names in {config_path}")
+    for i, stage in enumerate(stages):
+        unknown = set(stage.after) - set(names[:i])
+        if unknown:
+            raise ValueError(f"{stage.name}: \"after\" must name earlier stages, got {', '.join(sorted(unknown))}")
+    return stages
+
+
+def select(stages: list[Stage], patterns: list[str]) -> list[Stage]:
+    """Stages named (or prefixed, e.g. "educa") on the command line; all non-manual otherwise.
+
+    A manual stage is only selected by its exact name, never by a prefix.
+    """
+    if not patterns:
+        return [s for s in stages if not s.manual]
+    return [
+        s for s in stages
+        if any(s.name == p or (not s.manual and s.name.startswith(p + ".")) for p in patterns)
+    ]
+
+
+class Runner:
+    def __init__(
+        self,
+        root: str,
+        cache: StageCache,
+        force: bool = False,
+        dry_run: bool = False,
+        verbose: bool = False,
+        strict: bool = False,
+    ):
+        self.root = root
+        self.cache = cache
+        self.force = force
+        self.dry_run = dry_run
+        self.verbose = verbose
+        self.strict = strict
+        self.print_lock = threading.Lock()
+        self.env = dict(os.environ)
+        self.env["PYTHONPATH"] = os.pathsep.join(filter(None, [LIB_DIR, os.environ.get("PYTHONPATH")]))
+        self.env["WORKSPACE_ROOT"] = root
+
+    def log(self, message: str) -> None:
+        with self.print_lock:
+            print(message, flush=True)
+
+    def run_command(self, cmd: list[str]) -> tuple[subprocess.CompletedProcess, Optional[object]]:
+        """Run cmd; also returns the child's resource usage (struct_rusage) where os.wait4 exists."""
+        if not hasattr(os, "wait4"):
+            return subprocess.run(cmd, cwd=self.root, env=self.env, capture_output=True, text=True), None
+        with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+            proc = subprocess.Popen(cmd, cwd=self.root, env=self.env, stdout=out, stderr=err)
+            _pid, status, usage = os.wait4(proc.pid, 0)
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            out.seek(0)
+            err.seek(0)
+            stdout = out.read().decode("utf-8", "replace")
+            stderr = err.read().decode("utf-8", "replace")
+        return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr), usage
+
+    def run_stage(self, stage: Stage) -> str:
+        """Returns "ran", "cached", "failed" or "warned" (a failed advisory stage)."""
+        if not self.force and self.cache.is_fresh(self.root, stage):
+            self.log(f"  ⏭️  {stage.name} (cached)")
+            return "cached"
+        if self.dry_run:
+            self.log(f"  ▶️  {stage.name} (would run: {' '.join(stage.cmd)})")
+            return "ran"
+
+        start = time.perf_counter()
+        # Bytes read/written are not available for a child process; peak memory comes from its rusage.
+        with profiling.stage(stage.name, measure=False) as rec:
+            proc, usage = self.run_command(stage.cmd)
+            if usage is not None:
+                rec.peak_rss_kb = profiling.maxrss_kb(usage)
+        elapsed = time.perf_counter() - start
+        if proc.returncode != 0 and stage.advisory and not self.strict:
+            self.log(
+                f"  ⚠️  {stage.name} failed ({elapsed:.1f}s, exit {proc.returncode}); advisory, not blocking\n"
+                f"{proc.stdout}{proc.stderr}"
+            )
+            return "warned"
+        if proc.returncode != 0:
+            self.log(f"  ❌ {stage.name} failed ({elapsed:.1f}s, exit {proc.returncode})\n{proc.stdout}{proc.stderr}")
+            return "failed"
+        self.cache.record(self.root, stage)
+        output = f"\n{proc.stdout.rstrip()}" if self.verbose and proc.stdout.strip() else ""
+        # Warnings go to stderr: show them even when the stage succeeds.
+        warnings = f"\n{proc.stderr.rstrip()}" if proc.stderr.strip() else ""
+        self.log(f"  ✅ {stage.name} ({elapsed:.1f}s){output}{warnings}")
+        return "ran"
+
+    def run(self, stages: list[Stage], jobs: int) -> dict[str, str]:
+        selected = {s.name for s in stages}
+        pending = {s.name: s for s in stages}
+        results: dict[str, str] = {}
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            running = {}
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    deps = stage.deps & selected
+                    if any(results.get(d) in ("failed", "blocked") for d in deps):
+                        results[name] = "blocked"
+                        self.log(f"  ⛔ {name} (blocked by failed dependency)")
+                        del pending[name]
+                    elif all(d in results for d in deps):
+                        running[pool.submit(self.run_stage, stage)] = name
+                        del pending[name]
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[running.pop(future)] = future.result()
+        return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the data pipeline (cached, parallel stages)")
+    parser.add_argument("stages", nargs="*", help="Stage names or pack prefixes (default: all non-manual)")
+    parser.add_argument("--config", default=DEFAULT_CONFIG, help="Pipeline config (default: config/pipeline.json)")
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help="Stage cache file")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 2, help="Parallel stages")
+    parser.add_argument("--force", action="store_true", help="Ignore the cache and rerun selected stages")
+    parser.add_argument("--dry-run", action="store_true", help="Show what would run")
+    parser.add_argument("--list", action="store_true", help="List stages and their dependencies")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Show stage output on success")
+    parser.add_argument("--strict", action="store_true", help="Treat failing advisory stages as failures")
+    parser.add_argument(
+        "--profile",
+        metavar="DIR",
+        default=None,
+        help="Write a Chrome trace of the run, plus one per profiled stage script, into DIR",
+    )
+    args = parser.parse_args()
+    if args.profile:
+        trace_dir = os.path.abspath(args.profile) + os.sep
+        os.environ[profiling.ENV_PROFILE] = trace_dir
+        profiling.enable(profiling.resolve_trace_path(trace_dir, "pipeline"))
+
+    root = os.environ.get("WORKSPACE_ROOT") or WORKSPACE_ROOT
+    all_stages = load_stages(args.config)
+    plan(root, all_stages)
+
+    if args.list:
+        for stage in all_stages:
+            deps = ", ".join(sorted(stage.deps)) or "-"
+            flags = "".join(f"({flag}) " for flag in ("manual", "advisory") if getattr(stage, flag))
+            print(f"{stage.name:<28} {flags}after: {deps}")
+        return 0
+
+    stages = select(all_stages, args.stages)
+    if not stages:
+        print(f"❌ No stages match: {' '.join(args.stages)}", file=sys.stderr)
+        return 1
+
+    print(f"═══ Pipeline: {len(stages)} stage(s), {args.jobs} job(s) ═══")
+    start = time.perf_counter()
+    runner = Runner(root, StageCache(args.cache), force=args.force, dry_run=args.dry_run, verbose=args.verbose, strict=args.strict)
+    results = runner.run(stages, args.jobs)
+
+    counts: dict[str, int] = {}
+    for status in results.values():
+        counts[status] = counts.get(status, 0) + 1
+    summary = ", ".join(f"{n} {status}" for status, n in sorted(counts.items()))
+    print(f"Done in {time.perf_counter() - start:.1f}s: {summary}")
+    return 1 if any(status in ("failed", "blocked") for status in results.values()) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
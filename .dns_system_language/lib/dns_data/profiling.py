@@ -0,0 +1,264 @@
+"""
+Opt-in instrumentation for toolkit scripts.
+
+Disabled unless a script is run with --profile [PATH] or DNS_PROFILE is set
+(a file path, a directory ending in "/", or "1" for the default path). When
+enabled, each profiled call records wall time, items and items/sec, bytes
+read/written by the process (Linux /proc/self/io), the process's peak RSS so
+far and how much the call raised it; a summary is printed to stderr at exit
+and a Chrome trace (chrome://tracing, Perfetto) is written. Peak RSS is a
+lifetime high-water mark, so the growth column (+peak MB) is the one that
+points at the stage that needed the memory; a stage that stays below an
+earlier peak shows 0. --profile-cprofile / DNS_PROFILE_CPROFILE=1 also dumps
+cProfile stats next to the trace.
+
+  from dns_data import profiling
+
+  @profiling.profiled("validate_file", items=lambda result, *args: result.stats["total_items"])
+  def validate_file(...): ...
+
+  with profiling.stage("build_dataset") as rec:
+      ...
+      rec.items = len(records)
+"""
+
+import argparse
+import atexit
+import cProfile
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ENV_PROFILE = "DNS_PROFILE"
+ENV_CPROFILE = "DNS_PROFILE_CPROFILE"
+
+
+@dataclass
+class StageRecord:
+    name: str
+    start: float
+    tid: int
+    args: dict = field(default_factory=dict)
+    duration: float = 0.0
+    items: Optional[int] = None
+    bytes_read: Optional[int] = None
+    bytes_written: Optional[int] = None
+    peak_rss_kb: Optional[int] = None
+    peak_rss_growth_kb: Optional[int] = None
+
+    @property
+    def items_per_sec(self) -> Optional[float]:
+        if self.items is None or self.duration <= 0:
+            return None
+        return self.items / self.duration
+
+
+def read_io_counters() -> Optional[tuple[int, int]]:
+    """(bytes read, bytes written) by this process so far, where the OS exposes it."""
+    try:
+        with open("/proc/self/io", "r", encoding="ascii") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+        return int(fields["rchar"]), int(fields["wchar"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def maxrss_kb(usage) -> int:
+    """ru_maxrss of a struct_rusage in kilobytes (it is bytes on macOS, kilobytes on Linux)."""
+    return usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+
+
+def peak_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    return maxrss_kb(resource.getrusage(resource.RUSAGE_SELF))
+
+
+class Profiler:
+    def __init__(self, trace_path: str, use_cprofile: bool = False):
+        self.trace_path = trace_path
+        self.records: list[StageRecord] = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.origin = time.perf_counter()
+        self.cprofile = cProfile.Profile() if use_cprofile else None
+        if self.cprofile:
+            self.cprofile.enable()
+
+    def active(self) -> list[StageRecord]:
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack
+
+    @contextmanager
+    def stage(self, name: str, measure: bool = True, **args) -> Iterator[StageRecord]:
+        """Time a stage; with measure=False I/O and memory are left to the caller (e.g. a subprocess)."""
+        rec = StageRecord(name, time.perf_counter(), threading.get_ident(), args)
+        io_before = read_io_counters() if measure else None
+        rss_before = peak_rss_kb() if measure else None
+        self.active().append(rec)
+        try:
+            yield rec
+        finally:
+            self.active().pop()
+            rec.duration = time.perf_counter() - rec.start
+            io_after = read_io_counters() if measure else None
+            if io_before and io_after:
+                rec.bytes_read = (rec.bytes_read or 0) + io_after[0] - io_before[0]
+                rec.bytes_written = (rec.bytes_written or 0) + io_after[1] - io_before[1]
+            if measure:
+                rec.peak_rss_kb = peak_rss_kb()
+                if rss_before is not None and rec.peak_rss_kb is not None:
+                    rec.peak_rss_growth_kb = rec.peak_rss_kb - rss_before
+            with self.lock:
+                self.records.append(rec)
+
+    def count(self, items: int) -> None:
+        """Add items to the innermost open stage on this thread."""
+        stack = self.active()
+        if stack:
+            stack[-1].items = (stack[-1].items or 0) + items
+
+    def trace_events(self) -> list[dict]:
+        pid = os.getpid()
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": os.path.basename(sys.argv[0])}}]
+        for rec in sorted(self.records, key=lambda r: r.start):
+            args = dict(rec.args)
+            for key in ("items", "bytes_read", "bytes_written", "peak_rss_kb", "peak_rss_growth_kb"):
+                if getattr(rec, key) is not None:
+                    args[key] = getattr(rec, key)
+            if rec.items_per_sec is not None:
+                args["items_per_sec"] = round(rec.items_per_sec, 1)
+            events.append({
+                "name": rec.name,
+                "cat": "stage",
+                "ph": "X",
+                "ts": round((rec.start - self.origin) * 1e6),
+                "dur": round(rec.duration * 1e6),
+                "pid": pid,
+                "tid": rec.tid,
+                "args": args,
+            })
+        return events
+
+    def summary(self) -> str:
+        lines = [
+            f"{'stage':<28} {'wall s':>8} {'items':>9} {'items/s':>11} {'read MB':>9} {'write MB':>9} "
+            f"{'proc peak MB':>12} {'+peak MB':>9}"
+        ]
+        for rec in sorted(self.records, key=lambda r: r.start):
+            ips = rec.items_per_sec
+            lines.append(
+                f"{rec.name[:28]:<28} {rec.duration:>8.3f} "
+                f"{rec.items if rec.items is not None else '-':>9} "
+                f"{f'{ips:,.0f}' if ips is not None else '-':>11} "
+                f"{_mb(rec.bytes_read):>9} {_mb(rec.bytes_written):>9} "
+                f"{_mb(rec.peak_rss_kb * 1024 if rec.peak_rss_kb else None):>12} "
+                f"{_mb(rec.peak_rss_growth_kb * 1024 if rec.peak_rss_growth_kb is not None else None):>9}"
+            )
+        return "\n".join(lines)
+
+    def finish(self) -> None:
+        if self.cprofile:
+            self.cprofile.disable()
+            self.cprofile.dump_stats(os.path.splitext(self.trace_path)[0] + ".prof")
+        if not self.records:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.trace_path)), exist_ok=True)
+        with open(self.trace_path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}, f)
+        print(f"\n⏱️  Profile ({self.trace_path})\n{self.summary()}", file=sys.stderr)
+
+
+def _mb(n: Optional[int]) -> str:
+    return "-" if n is None else f"{n / 1_048_576:.2f}"
+
+
+_profiler: Optional[Profiler] = None
+
+
+def resolve_trace_path(value: str, script: str) -> str:
+    """Trace file for a --profile / DNS_PROFILE value."""
+    name = f"{script}-{os.getpid()}.trace.json"
+    if value in ("", "1", "true"):
+        return os.path.abspath(name)
+    if value.endswith(("/", os.sep)) or os.path.isdir(value):
+        return os.path.join(os.path.abspath(value), name)
+    return os.path.abspath(value)
+
+
+def enable(trace_path: str, use_cprofile: bool = False) -> Profiler:
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler(trace_path, use_cprofile)
+        atexit.register(_profiler.finish)
+    return _profiler
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="1",
+        default=None,
+        metavar="PATH",
+        help=f"Record per-stage timings and write a Chrome trace (or set {ENV_PROFILE})",
+    )
+    parser.add_argument("--profile-cprofile", action="store_true", help="Also dump cProfile stats next to the trace")
+
+
+def configure(args: Optional[argparse.Namespace] = None, script: Optional[str] = None) -> Optional[Profiler]:
+    """Enable profiling from parsed --profile flags or the environment."""
+    value = getattr(args, "profile", None) or os.environ.get(ENV_PROFILE)
+    if not value or value in ("0", "false"):
+        return None
+    use_cprofile = bool(getattr(args, "profile_cprofile", False)) or os.environ.get(ENV_CPROFILE) == "1"
+    script = script or os.path.splitext(os.path.basename(sys.argv[0]))[0] or "python"
+    return enable(resolve_trace_path(value, script), use_cprofile)
+
+
+@contextmanager
+def stage(name: str, measure: bool = True, **args) -> Iterator[Optional[StageRecord]]:
+    """Record a stage when profiling is enabled; yields a throwaway record otherwise."""
+    if _profiler is None:
+        yield StageRecord(name, 0.0, 0)
+        return
+    with _profiler.stage(name, measure=measure, **args) as rec:
+        yield rec
+
+
+def count(items: int) -> None:
+    if _profiler is not None:
+        _profiler.count(items)
+
+
+def profiled(name: Optional[str] = None, items: Optional[Callable[..., int]] = None) -> Callable:
+    """Decorator form of stage(); items(result, *args, **kwargs) sets the item count."""
+
+    def decorator(fn: Callable) -> Callable:
+        stage_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _profiler is None:
+                return fn(*args, **kwargs)
+            with _profiler.stage(stage_name) as rec:
+                result = fn(*args, **kwargs)
+                if items is not None:
+                    rec.items = items(result, *args, **kwargs)
+                return result
+
+        return wrapper
+
+    return decorator
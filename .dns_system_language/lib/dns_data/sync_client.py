@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Reference sync client for manifest-driven data packs, plus a sync benchmark.
+
+Does what the apps do against base_url: fetch manifest.json, diff it against
+the manifest of the last sync, and download only what changed. It uses a
+keep-alive connection pool and concurrent fetches. A file is skipped without
+a request when its manifest entry is unchanged and the local copy is intact,
+or when its local sha256 matches the manifest hash. Otherwise it is
+revalidated with If-None-Match, and an interrupted download resumes with
+Range / If-Range. Files are fetched gzip-encoded when the server offers it,
+checked against the manifest hash when there is one, and replaced
+atomically. Sync state is kept in <dest>/.sync_state.json.
+
+The bench command serves a pack with dns_data.content_server and reports
+requests, bytes on the wire and wall time for a cold sync (empty
+destination) and warm syncs (nothing changed).
+
+Usage:
+  python3 -m dns_data.sync_client sync http://127.0.0.1:8765 /tmp/educa
+  python3 -m dns_data.sync_client bench educa_data --latency-ms 50
+"""
+
+import argparse
+import gzip
+import hashlib
+import http.client
+import json
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from dns_data.writers import file_sha256, write_bytes, write_json
+
+STATE_FILE = ".sync_state.json"
+MANIFEST_NAME = "manifest.json"
+DEFAULT_WORKERS = 6
+
+
+class SyncError(Exception):
+    pass
+
+
+@dataclass
+class SyncReport:
+    label: str = ""
+    files: int = 0
+    downloaded: int = 0
+    resumed: int = 0
+    not_modified: int = 0
+    unchanged: int = 0
+    failed: list[str] = field(default_factory=list)
+    failed_files: set[str] = field(default_factory=set, repr=False)
+    requests: int = 0
+    connections: int = 0
+    wire_bytes: int = 0
+    content_bytes: int = 0
+    seconds: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, **counts: int) -> None:
+        with self.lock:
+            for name, n in counts.items():
+                setattr(self, name, getattr(self, name) + n)
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections to one origin, at most size in use at once."""
+
+    def __init__(self, base_url: str, size: int = DEFAULT_WORKERS, timeout: float = 30.0):
+        parts = urllib.parse.urlsplit(base_url)
+        if parts.scheme not in ("http", "https"):
+            raise SyncError(f"Unsupported base_url: {base_url}")
+        self.scheme = parts.scheme
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(size)
+        self.opened = 0
+        self.lock = threading.Lock()
+
+    def connect(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        with self.lock:
+            self.opened += 1
+        return cls(self.netloc, timeout=self.timeout)
+
+    @contextmanager
+    def request(self, method: str, rel: str, headers: dict[str, str]) -> Iterator[http.client.HTTPResponse]:
+        """Send a request and yield the response; the body must be read inside the block."""
+        url = f"{self.prefix}/{urllib.parse.quote(rel)}"
+        with self.slots:
+            try:
+                conn = self.idle.get_nowait()
+            except queue.Empty:
+                conn = self.connect()
+            for attempt in range(2):
+                try:
+                    conn.request(method, url, headers=headers)
+                    resp = conn.getresponse()
+                    break
+                except (http.client.HTTPException, OSError):
+                    # An idle keep-alive connection may have been closed by the server: retry once on a new one.
+                    conn.close()
+                    if attempt:
+                        raise
+                    conn = self.connect()
+            try:
+                yield resp
+            except BaseException:
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self.idle.put(conn)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def manifest_entries(manifest: dict) -> dict[str, dict]:
+    """Files a manifest publishes (including facet indexes), keyed by pack-relative path."""
+    entries = {}
+    for key, entry in manifest.get("files", {}).items():
+        rel = entry.get("path") or entry.get("filename") or key
+        entries[rel] = {k: v for k, v in entry.items() if k != "facet_index"}
+        index = entry.get("facet_index")
+        if index and index.get("path"):
+            entries[index["path"]] = dict(index)
+    return entries
+
+
+def file_stamp(path: str) -> Optional[list[int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+class SyncClient:
+    def __init__(self, base_url: str, dest: str, workers: int = DEFAULT_WORKERS, use_gzip: bool = True, revalidate: bool = False):
+        self.dest = os.path.abspath(dest)
+        self.pool = ConnectionPool(base_url, size=workers)
+        self.workers = workers
+        self.use_gzip = use_gzip
+        self.revalidate = revalidate
+        self.state_path = os.path.join(self.dest, STATE_FILE)
+        self.state = {"manifest": {}, "etags": {}, "stamps": {}, "partial": {}}
+        if os.path.isfile(self.state_path):
+            try:
+                with open(self.state_path, "r", encoding="utf-8") as f:
+                    self.state.update(json.load(f))
+            except (OSError, json.JSONDecodeError):
+                pass
+        self.state_lock = threading.Lock()
+
+    def local_path(self, rel: str) -> str:
+        path = os.path.normpath(os.path.join(self.dest, *rel.split("/")))
+        if not path.startswith(self.dest + os.sep):
+            raise SyncError(f"Refusing path outside destination: {rel}")
+        return path
+
+    def fetch(self, rel: str, report: SyncReport, expected_hash: str = "") -> str:
+        """Bring one file up to date; returns "downloaded", "resumed" or "not_modified"."""
+        path = self.local_path(rel)
+        part = path + ".part"
+        headers = {"Accept-Encoding": "gzip"} if self.use_gzip else {}
+        with self.state_lock:
+            etag = self.state["etags"].get(rel)
+            part_etag = self.state["partial"].get(rel)
+        offset = 0
+        if part_etag and os.path.isfile(part):
+            # Resume an interrupted identity download; If-Range falls back to a full body if it changed.
+            offset = os.path.getsize(part)
+            headers = {"Range": f"bytes={offset}-", "If-Range": part_etag}
+        elif etag and os.path.isfile(path):
+            headers["If-None-Match"] = etag
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self.pool.request("GET", rel, headers) as resp:
+            report.add(requests=1)
+            if resp.status == 304:
+                resp.read()
+                return "not_modified"
+            if resp.status not in (200, 206):
+                resp.read()
+                raise SyncError(f"{rel}: HTTP {resp.status}")
+            new_etag = resp.getheader("ETag") or ""
+            gzipped = resp.getheader("Content-Encoding") == "gzip"
+            mode = "ab" if resp.status == 206 else "wb"
+            with self.state_lock:
+                if not gzipped and new_etag:
+                    self.state["partial"][rel] = new_etag
+                else:
+                    self.state["partial"].pop(rel, None)
+            with open(part, mode) as f:
+                for chunk in iter(lambda: resp.read(1 << 16), b""):
+                    f.write(chunk)
+                    report.add(wire_bytes=len(chunk))
+
+        with open(part, "rb") as f:
+            body = f.read()
+        content = gzip.decompress(body) if gzipped else body
+        if expected_hash and hashlib.sha256(content).hexdigest() != expected_hash:
+            os.unlink(part)
+            with self.state_lock:
+                self.state["partial"].pop(rel, None)
+            raise SyncError(f"{rel}: content does not match manifest hash")
+        write_bytes(path, content)
+        os.unlink(part)
+        report.add(content_bytes=len(content))
+        with self.state_lock:
+            self.state["partial"].pop(rel, None)
+            self.state["etags"][rel] = new_etag
+            self.state["stamps"][rel] = file_stamp(path)
+        return "resumed" if resp.status == 206 else "downloaded"
+
+    def is_current(self, rel: str, entry: dict) -> bool:
+        """True when the local copy can be trusted without asking the server."""
+        path = self.local_path(rel)
+        stamp = file_stamp(path)
+        if stamp is None:
+            return False
+        with self.state_lock:
+            previous = self.state["manifest"].get(rel)
+            recorded = self.state["stamps"].get(rel)
+        if entry.get("hash"):
+            if previous == entry and recorded == stamp:
+                return True
+            if file_sha256(path) == entry["hash"]:
+                with self.state_lock:
+                    self.state["stamps"][rel] = stamp
+                return True
+            return False
+        # Without a hash the manifest cannot prove the content: trust it only when the entry is unchanged.
+        return not self.revalidate and previous == entry and recorded == stamp
+
+    def sync_entry(self, rel: str, entry: dict, report: SyncReport) -> None:
+        try:
+            if self.is_current(rel, entry):
+                report.add(unchanged=1)
+                return
+            outcome = self.fetch(rel, report, entry.get("hash") or "")
+            report.add(**{outcome: 1})
+        except Exception as e:
+            # Anything else (e.g. EOFError from a truncated gzip body) must fail the file, not vanish.
+            message = e if isinstance(e, (SyncError, OSError, http.client.HTTPException)) else repr(e)
+            with report.lock:
+                report.failed.append(f"{rel}: {message}")
+                report.failed_files.add(rel)
+
+    def sync(self, label: str = "") -> SyncReport:
+        report = SyncReport(label=label)
+        start = time.perf_counter()
+        os.makedirs(self.dest, exist_ok=True)
+        manifest_path = self.local_path(MANIFEST_NAME)
+        self.fetch(MANIFEST_NAME, report)
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            entries = manifest_entries(json.load(f))
+        report.files = len(entries)
+
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as pool:
+            futures = [pool.submit(self.sync_entry, rel, entry, report) for rel, entry in entries.items()]
+            for future in futures:
+                future.result()
+
+        failed = report.failed_files
+        with self.state_lock:
+            # Failed files keep their old entry so the next sync retries them.
+            self.state["manifest"] = {
+                rel: (self.state["manifest"].get(rel) if rel in failed else entry) for rel, entry in entries.items()
+            }
+            write_json(self.state_path, self.state, newline=True)
+        report.connections = self.pool.opened
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+def format_reports(reports: list[SyncReport]) -> str:
+    lines = [
+        f"{'sync':<22} {'files':>6} {'fetched':>8} {'304':>5} {'skipped':>8} {'requests':>9} "
+        f"{'conns':>6} {'wire KB':>9} {'data KB':>9} {'wall ms':>9}"
+    ]
+    for r in reports:
+        lines.append(
+            f"{r.label:<22} {r.files:>6} {r.downloaded + r.resumed:>8} {r.not_modified:>5} {r.unchanged:>8} "
+            f"{r.requests:>9} {r.connections:>6} {r.wire_bytes / 1024:>9.1f} {r.content_bytes / 1024:>9.1f} "
+            f"{r.seconds * 1000:>9.1f}"
+        )
+    return "\n".join(lines)
+
+
+def run_sync(base_url: str, dest: str, label: str, **options) -> SyncReport:
+    client = SyncClient(base_url, dest, **options)
+    try:
+        return client.sync(label)
+    finally:
+        client.close()
+
+
+def bench(pack_dir: str, latency_ms: float, workers: int, use_gzip: bool) -> list[SyncReport]:
+    from dns_data.content_server import make_server
+
+    server = make_server(pack_dir, latency_ms=latency_ms)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    base_url = f"http://{host}:{port}"
+    dest = tempfile.mkdtemp(prefix="dns-sync-bench.")
+    options = {"workers": workers, "use_gzip": use_gzip}
+    try:
+        return [
+            run_sync(base_url, dest, "cold", **options),
+            run_sync(base_url, dest, "warm", **options),
+            run_sync(base_url, dest, "warm (revalidate)", revalidate=True, **options),
+        ]
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(dest, ignore_errors=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Manifest-diff sync client and sync benchmark")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_sync = sub.add_parser("sync", help="Sync a pack from base_url into a directory")
+    p_sync.add_argument("base_url", help="URL of the pack root (the directory holding manifest.json)")
+    p_sync.add_argument("dest", help="Local directory")
+    p_sync.add_argument("--revalidate", action="store_true", help="Ask the server about files without a manifest hash")
+
+    p_bench = sub.add_parser("bench", help="Serve a pack locally and time cold vs warm sync")
+    p_bench.add_argument("pack_dir", help="Pack directory containing manifest.json")
+    p_bench.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every response")
+
+    for p in (p_sync, p_bench):
+        p.add_argument("--workers", "-j", type=int, default=DEFAULT_WORKERS, help="Concurrent fetches / pooled connections")
+        p.add_argument("--no-gzip", dest="use_gzip", action="store_false", help="Do not request gzip encoding")
+    args = parser.parse_args()
+
+    if args.command == "sync":
+        reports = [run_sync(args.base_url, args.dest, "sync", workers=args.workers, use_gzip=args.use_gzip, revalidate=args.revalidate)]
+    else:
+        reports = bench(args.pack_dir, args.latency_ms, args.workers, args.use_gzip)
+
+    print(format_reports(reports))
+    failed = [line for r in reports for line in r.failed]
+    for line in failed:
+        print(f"❌ {line}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
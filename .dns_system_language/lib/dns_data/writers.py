@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Atomic, skip-if-unchanged file writers.
+
+Content is serialised in memory and compared (size, then sha256) with the file
+already on disk. Unchanged files are left alone, so their mtimes stay put and
+downstream stages that key on them stay cached. Changed files are written to a
+temporary file in the same directory and renamed over the target, so readers
+never see a half-written file. write_json_many() runs independent writes on a
+thread pool.
+
+Usage:
+  from dns_data.writers import write_json, write_json_many
+  if write_json("educa_data/manifest.json", manifest, newline=True): ...
+  write_json_many({path: payload, ...})      # {path: True if written}
+  file_sha256("educa_data/data/jobs.json")   # hex digest, read in 1 MiB chunks
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Mapping, Optional
+
+DEFAULT_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+_umask: Optional[int] = None
+_umask_lock = threading.Lock()
+
+
+def dumps_json(obj: Any, indent: Optional[int] = 2, ensure_ascii: bool = False, newline: bool = False, **kwargs) -> bytes:
+    """json.dumps with the repo's defaults, encoded as UTF-8."""
+    text = json.dumps(obj, indent=indent, ensure_ascii=ensure_ascii, **kwargs)
+    return (text + "\n" if newline else text).encode("utf-8")
+
+
+def file_sha256(path: str | os.PathLike) -> str:
+    """Hex sha256 of a file, read in chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def same_content(path: str, data: bytes) -> bool:
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        return file_sha256(path) == hashlib.sha256(data).hexdigest()
+    except OSError:
+        return False
+
+
+def current_umask() -> int:
+    """Process umask, read from /proc/self/status where available.
+
+    Elsewhere os.umask() has to set it to query it, so that is done once,
+    lazily and under a lock, and the result is cached.
+    """
+    global _umask
+    if _umask is not None:
+        return _umask
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError, IndexError):
+        pass
+    with _umask_lock:
+        if _umask is None:
+            _umask = os.umask(0o022)
+            os.umask(_umask)
+    return _umask
+
+
+def _file_mode(path: str) -> int:
+    """Mode for the replacement: the existing file's, or the umask default for new files."""
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        return 0o666 & ~current_umask()
+
+
+def write_bytes(path: str | os.PathLike, data: bytes) -> bool:
+    """Atomically replace path with data unless it already holds it; True if written."""
+    path = os.fspath(path)
+    if same_content(path, data):
+        return False
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    mode = _file_mode(path)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return True
+
+
+def write_json(path: str | os.PathLike, obj: Any, **dump_kwargs) -> bool:
+    """Serialise obj (see dumps_json) and write_bytes it; True if the file changed."""
+    return write_bytes(path, dumps_json(obj, **dump_kwargs))
+
+
+def write_json_many(payloads: Mapping[str, Any], max_workers: int = DEFAULT_WORKERS, **dump_kwargs) -> dict[str, bool]:
+    """write_json every path → obj concurrently; returns {path: written}."""
+    if len(payloads) <= 1 or max_workers <= 1:
+        return {path: write_json(path, obj, **dump_kwargs) for path, obj in payloads.items()}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(payloads))) as pool:
+        futures = {path: pool.submit(write_json, path, obj, **dump_kwargs) for path, obj in payloads.items()}
+        return {path: future.result() for path, future in futures.items()}
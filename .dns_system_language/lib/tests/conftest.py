@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Scripts put the lib directory on sys.path (or PYTHONPATH) to import dns_data.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,58 @@
+import os
+import sys
+
+from dns_data.pipeline import Runner, Stage, StageCache, load_stages, plan, select
+
+CONFIG = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "config", "pipeline.json")
+
+
+def stages():
+    return [
+        Stage("spicebite.fetch", ["fetch"], manual=True),
+        Stage("spicebite.reviews", ["reviews"]),
+        Stage("spicebite.validate", ["validate"]),
+        Stage("educa.validate", ["validate"]),
+    ]
+
+
+def names(selected):
+    return [s.name for s in selected]
+
+
+def test_default_selection_skips_manual_stages():
+    assert names(select(stages(), [])) == ["spicebite.reviews", "spicebite.validate", "educa.validate"]
+
+
+def test_prefix_does_not_select_manual_stages():
+    assert names(select(stages(), ["spicebite"])) == ["spicebite.reviews", "spicebite.validate"]
+
+
+def test_exact_name_selects_manual_stage():
+    assert names(select(stages(), ["spicebite.fetch", "spicebite"])) == [
+        "spicebite.fetch",
+        "spicebite.reviews",
+        "spicebite.validate",
+    ]
+
+
+def test_config_fetch_is_manual():
+    config = load_stages(CONFIG)
+    assert "spicebite.fetch" not in names(select(config, ["spicebite"]))
+    assert "spicebite.fetch" in names(select(config, ["spicebite.fetch"]))
+
+
+def run(tmp_path, strict):
+    check = Stage("pack.validate", [sys.executable, "-c", "raise SystemExit(1)"], advisory=True)
+    publish = Stage("pack.manifest", [sys.executable, "-c", "pass"], after=["pack.validate"])
+    stages = [check, publish]
+    plan(str(tmp_path), stages)
+    runner = Runner(str(tmp_path), StageCache(str(tmp_path / "cache.json")), strict=strict)
+    return runner.run(stages, jobs=1)
+
+
+def test_failing_advisory_stage_does_not_block(tmp_path):
+    assert run(tmp_path, strict=False) == {"pack.validate": "warned", "pack.manifest": "ran"}
+
+
+def test_strict_blocks_on_failing_advisory_stage(tmp_path):
+    assert run(tmp_path, strict=True) == {"pack.validate": "failed", "pack.manifest": "blocked"}
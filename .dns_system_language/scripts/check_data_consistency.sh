@@ -22,6 +22,7 @@ PREFIX="${LEVEL_FILE_PREFIX:-nepali_learning_data}"
 LEVELS=(beginner elementary intermediate advanced proficient)
 DATA_PATH="$WORKSPACE_ROOT/$DATA_DIR"
 MANIFEST_PATH="$DATA_PATH/manifest.json"
+export PYTHONPATH="$DNS_SYSTEM/lib${PYTHONPATH:+:$PYTHONPATH}"
 
 echo "═══ Data consistency check (app use) ═══"
 echo "Data dir: $DATA_PATH"
@@ -48,7 +49,8 @@ done
 # 2. Practice: correctAnswer in options, Listening has audioText (Python check)
 check_practice() {
   python3 << 'PY'
-import json, os, sys
+import os, sys
+from dns_data.jsonio import load_json
 data_dir = os.environ.get("DATA_PATH", "nplearning")
 prefix = os.environ.get("PREFIX", "nepali_learning_data")
 levels = ["beginner", "elementary", "intermediate", "advanced", "proficient"]
@@ -57,8 +59,7 @@ for lev in levels:
   path = os.path.join(data_dir, f"{prefix}_{lev}.json")
   if not os.path.isfile(path):
     continue
-  with open(path, "r", encoding="utf-8") as f:
-    data = json.load(f)
+  data = load_json(path)
   for p in data.get("practice", []):
     opts = p.get("options", [])
     correct = p.get("correctAnswer", "")
@@ -82,21 +83,22 @@ fi
 if [[ -f "$MANIFEST_PATH" ]]; then
   export DATA_PATH MANIFEST_PATH PREFIX
   python3 << PY
-import json, os
+import os
+from dns_data.jsonio import load_json
+from dns_data.writers import write_json
 data_path = os.environ.get("DATA_PATH", ".")
 manifest_path = os.environ.get("MANIFEST_PATH", "manifest.json")
 prefix = os.environ.get("PREFIX", "nepali_learning_data")
 levels = ["beginner", "elementary", "intermediate", "advanced", "proficient"]
-with open(manifest_path, "r", encoding="utf-8") as f:
-    m = json.load(f)
+m = load_json(manifest_path, memo=False)
 for lev in levels:
     fn = f"{prefix}_{lev}.json"
     path = os.path.join(data_path, fn)
     if os.path.isfile(path) and "files" in m and fn in m["files"]:
         m["files"][fn]["size"] = os.path.getsize(path)
         print("Updated manifest size:", fn, m["files"][fn]["size"])
-with open(manifest_path, "w", encoding="utf-8") as f:
-    json.dump(m, f, indent=2)
+if write_json(manifest_path, m, newline=True):
+    print("Wrote", manifest_path)
 PY
   echo "✓ Manifest sizes updated"
 fi
@@ -0,0 +1,18 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Data pipeline runner – all packs (nplearning, sanskritlearning, educa, spicebite)
+# ═══════════════════════════════════════════════════════════════════════════
+# Stages: config/pipeline.json. Unchanged stages are skipped via the stage cache.
+# Run from anywhere: bash .dns_system_language/scripts/run_pipeline.sh [stage|pack ...] [--force] [--list]
+# ═══════════════════════════════════════════════════════════════════════════
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+DNS_SYSTEM="$(cd "$SCRIPT_DIR/.." && pwd)"
+WORKSPACE_ROOT="$(cd "$SCRIPT_DIR/../.." && pwd)"
+
+export WORKSPACE_ROOT
+export PYTHONPATH="$DNS_SYSTEM/lib${PYTHONPATH:+:$PYTHONPATH}"
+
+exec python3 -m dns_data.pipeline "$@"
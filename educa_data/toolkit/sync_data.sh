@@ -10,6 +10,7 @@ SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 DATA_DIR="$(dirname "$SCRIPT_DIR")"
 SCHEMA_FILE="$DATA_DIR/data_schema.json"
 MANIFEST_FILE="$DATA_DIR/manifest.json"
+DNS_LIB="$DATA_DIR/../.dns_system_language/lib"
 
 # Colors
 RED='\033[0;31m'
@@ -113,87 +114,75 @@ count_items() {
     
     local total=0
     
-    for file in "$DATA_DIR/data/"*.json; do
-        if [ -f "$file" ]; then
-            local filename=$(basename "$file")
-            local key=$(echo "$filename" | sed 's/.json//')
-            
-            # Try to count items from the array in the JSON
-            local count=$(python3 -c "
-import json
-try:
-    with open('$file', 'r') as f:
-        data = json.load(f)
-    for key in data:
-        if isinstance(data[key], list):
-            print(len(data[key]))
-            break
-    else:
-        print(0)
-except:
-    print(0)
-" 2>/dev/null | head -1 || echo "0")
-            
-            printf "%-20s %s\n" "$filename" "$count"
-            if [[ "$count" =~ ^[0-9]+$ ]]; then
-                total=$((total + count))
-            fi
+    # One interpreter for all files (shared JSON loader, fast backend when installed)
+    local counts
+    counts=$(PYTHONPATH="$DNS_LIB${PYTHONPATH:+:$PYTHONPATH}" python3 -m dns_data.jsonio count "$DATA_DIR/data/"*.json 2>/dev/null || true)
+    
+    while IFS=$'\t' read -r file count; do
+        [ -n "$file" ] || continue
+        printf "%-20s %s\n" "$(basename "$file")" "$count"
+        if [[ "$count" =~ ^[0-9]+$ ]]; then
+            total=$((total + count))
         fi
-    done
+    done <<< "$counts"
     
     echo "----------------------------------------"
     printf "%-20s %s\n" "TOTAL" "$total"
 }
 
+# Build facet indexes (data/index/*.facets.json) referenced from the manifest
+build_indexes() {
+    print_header "Building Facet Indexes"
+    
+    if PYTHONPATH="$DNS_LIB${PYTHONPATH:+:$PYTHONPATH}" python3 -m dns_data.facets "$DATA_DIR"; then
+        print_success "Facet indexes built"
+    else
+        print_error "Facet index build failed"
+        return 1
+    fi
+}
+
 # Update manifest version
 update_version() {
     local new_version="$1"
     
     print_header "Updating Version to $new_version"
     
-    # Update manifest.json
-    python3 << EOF
-import json
+    # Update manifest.json and every data file's version in one pass; only changed files are rewritten
+    NEW_VERSION="$new_version" MANIFEST_FILE="$MANIFEST_FILE" DATA_FILES_DIR="$DATA_DIR/data" \
+    PYTHONPATH="$DNS_LIB${PYTHONPATH:+:$PYTHONPATH}" python3 << 'EOF'
+import glob
+import os
 from datetime import datetime
 
-manifest_path = "$MANIFEST_FILE"
+from dns_data.jsonio import load_json
+from dns_data.writers import write_json, write_json_many
 
-with open(manifest_path, 'r') as f:
-    manifest = json.load(f)
+new_version = os.environ["NEW_VERSION"]
+today = datetime.now().strftime('%Y-%m-%d')
 
-manifest['version'] = "$new_version"
-manifest['last_updated'] = datetime.now().strftime('%Y-%m-%d')
+manifest_path = os.environ["MANIFEST_FILE"]
+manifest = load_json(manifest_path, memo=False)
+manifest['version'] = new_version
+manifest['last_updated'] = today
 
 # Update all file versions
 for key in manifest.get('files', {}):
-    manifest['files'][key]['version'] = "$new_version"
-
-with open(manifest_path, 'w') as f:
-    json.dump(manifest, f, indent=2)
+    manifest['files'][key]['version'] = new_version
 
-print(f"Updated manifest to version $new_version")
-EOF
-    
-    # Update each data file's version
-    for file in "$DATA_DIR/data/"*.json; do
-        if [ -f "$file" ]; then
-            python3 << EOF
-import json
-from datetime import datetime
-
-with open('$file', 'r') as f:
-    data = json.load(f)
-
-data['version'] = "$new_version"
-data['last_updated'] = datetime.now().strftime('%Y-%m-%d')
+write_json(manifest_path, manifest, newline=True)
+print(f"Updated manifest to version {new_version}")
 
-with open('$file', 'w') as f:
-    json.dump(data, f, indent=2, ensure_ascii=False)
+payloads = {}
+for path in sorted(glob.glob(os.path.join(os.environ["DATA_FILES_DIR"], "*.json"))):
+    data = load_json(path, memo=False)
+    data['version'] = new_version
+    data['last_updated'] = today
+    payloads[path] = data
 
-print(f"Updated $(basename $file)")
+for path, written in write_json_many(payloads).items():
+    print(f"{'Updated' if written else 'Unchanged'} {os.path.basename(path)}")
 EOF
-        fi
-    done
     
     print_success "Version updated to $new_version"
 }
@@ -258,7 +247,11 @@ full_pipeline() {
     count_items
     
     echo ""
-    print_info "Step 3: Git sync..."
+    print_info "Step 3: Building facet indexes..."
+    build_indexes
+    
+    echo ""
+    print_info "Step 4: Git sync..."
     git_sync "Update Educa data" "$should_push"
     
     echo ""
@@ -276,10 +269,11 @@ Usage:
 Commands:
   validate        Validate all JSON files
   count           Count items in each data file
+  index           Build facet indexes listed in manifest
   version <ver>   Update version number (e.g., 1.1.0)
   commit <msg>    Commit changes to git
   push            Commit and push to remote
-  full            Run full pipeline (validate → count → commit)
+  full            Run full pipeline (validate → count → index → commit)
   full --push     Run full pipeline with push
   help            Show this help message
 
@@ -310,6 +304,9 @@ case "${1:-}" in
     count)
         count_items
         ;;
+    index)
+        build_indexes
+        ;;
     version)
         if [ -z "${2:-}" ]; then
             print_error "Please provide version number (e.g., 1.1.0)"
@@ -13,6 +13,10 @@ from dataclasses import dataclass
 import re
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / ".dns_system_language" / "lib"))
+from dns_data import profiling
+from dns_data.jsonio import load_json
+
 @dataclass
 class ValidationResult:
     is_valid: bool
@@ -29,8 +33,7 @@ class EducaDataValidator:
         self.metadata = self.schema.get("metadata", {})
     
     def load_schema(self, path: Path) -> Dict:
-        with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return load_json(path)
     
     def validate_field(self, field_name: str, value: Any, field_schema: Dict) -> List[str]:
         """Validate a single field against its schema"""
@@ -106,6 +109,7 @@ class EducaDataValidator:
         
         return errors
     
+    @profiling.profiled(items=lambda result, self, file_path: result.stats["total_items"])
     def validate_file(self, file_path: Path) -> ValidationResult:
         """Validate a complete data file"""
         errors = []
@@ -127,8 +131,7 @@ class EducaDataValidator:
         
         # Load JSON
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = load_json(file_path)
         except json.JSONDecodeError as e:
             errors.append(f"Invalid JSON: {e}")
             return ValidationResult(False, errors, warnings, stats)
@@ -196,6 +199,7 @@ class EducaDataValidator:
         
         return ValidationResult(len(errors) == 0, errors, warnings, stats)
     
+    @profiling.profiled(items=lambda results, self, data_dir: len(results))
     def validate_all(self, data_dir: Path) -> Dict[str, ValidationResult]:
         """Validate all data files"""
         results = {}
@@ -258,8 +262,10 @@ def main():
     parser.add_argument("--data", default=None, help="Path to data directory")
     parser.add_argument("--file", default=None, help="Validate specific file")
     parser.add_argument("--quiet", action="store_true", help="Only show errors")
+    profiling.add_arguments(parser)
     
     args = parser.parse_args()
+    profiling.configure(args, "validate")
     
     # Determine paths
     script_dir = Path(__file__).parent
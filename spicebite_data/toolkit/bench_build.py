@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark OSM element → restaurant record conversion.
+
+Compares the per-element path (to_restaurant) with the bulk path
+(build_records) and checks that both produce identical records.
+
+Usage examples:
+  python3 bench_build.py --count 200000
+  python3 bench_build.py --input overpass_dump.json --repeat 5
+"""
+
+import argparse
+import json
+import random
+import time
+
+from build_osm import build_records, to_restaurant
+
+SAMPLE_CUISINES = [
+    "indian",
+    "nepali",
+    "indian;nepali",
+    "north_indian",
+    "South Indian",
+    "indian,pakistani",
+    "himalayan;tibetan",
+    "indo-nepali",
+    "curry",
+]
+SAMPLE_CITIES = [("Tokyo", "JP"), ("London", "GB"), ("Toronto", "CA"), ("Sydney", "AU"), ("Berlin", "DE")]
+
+
+def synthetic_elements(count: int, seed: int = 42) -> list[dict]:
+    rng = random.Random(seed)
+    elements = []
+    for i in range(count):
+        city, country = rng.choice(SAMPLE_CITIES)
+        tags = {
+            "name": f"Restaurant {i}",
+            "cuisine": rng.choice(SAMPLE_CUISINES),
+            "addr:street": f"{i % 97} Main Street",
+            "addr:housenumber": str(i % 300),
+            "addr:city": city,
+            "addr:country": country,
+        }
+        if i % 3 == 0:
+            tags["phone"] = f"+1 555 {i:07d}"
+        el = {"type": "node", "id": i, "lat": rng.uniform(-60, 60), "lon": rng.uniform(-180, 180), "tags": tags}
+        if i % 5 == 0:
+            el = {"type": "way", "id": i, "center": {"lat": el["lat"], "lon": el["lon"]}, "tags": tags}
+        elements.append(el)
+    return elements
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark restaurant record construction")
+    parser.add_argument("--count", type=int, default=100_000, help="Synthetic elements to generate")
+    parser.add_argument("--input", default=None, help="Overpass JSON dump to use instead of synthetic data")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per path (best time is reported)")
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input, "r", encoding="utf-8") as f:
+            elements = json.load(f).get("elements", [])
+    else:
+        elements = synthetic_elements(args.count)
+
+    per_element = [r for r in map(to_restaurant, elements) if r]
+    bulk = [r for _source, r in build_records(elements)]
+    if per_element != bulk:
+        print("❌ Bulk path output differs from per-element path")
+        return 1
+
+    t_single = best_of(lambda: [to_restaurant(el) for el in elements], args.repeat)
+    t_bulk = best_of(lambda: build_records(elements), args.repeat)
+
+    n = len(elements)
+    print(f"Elements: {n} ({len(bulk)} converted)")
+    print(f"  per-element: {t_single:.3f}s ({n / t_single:,.0f} el/s)")
+    print(f"  bulk:        {t_bulk:.3f}s ({n / t_bulk:,.0f} el/s)")
+    print(f"  speedup:     {t_single / t_bulk:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
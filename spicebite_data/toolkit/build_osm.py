@@ -6,16 +6,35 @@ Usage examples:
   python3 build_osm.py --country "Japan" --out ../data/restaurants_global.json
   python3 build_osm.py --bbox "34.0,135.0,36.0,140.0" --out ../data/restaurants_global.json
   python3 build_osm.py --country "United States" --country "United Kingdom" --out ../data/restaurants_global.json
+  python3 build_osm.py --country "Japan" --curated ../data/restaurants_global.json --out ../data/restaurants_global.json
+  python3 build_osm.py --country "Japan" --geocode --out ../data/restaurants_global.json
 """
 
 import argparse
 import datetime as dt
+import functools
+import gc
 import json
+import os
 import re
 import sys
 import urllib.parse
 import urllib.request
-from typing import Optional, Tuple
+from typing import Iterable, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".dns_system_language", "lib"))
+from dns_data import profiling
+from dns_data.writers import write_json
+from dedup import DEFAULT_PRECEDENCE, DEFAULT_RADIUS_M, dedupe_restaurants, record_source
+from geocode import (
+    DEFAULT_CITIES_PATH,
+    DEFAULT_MAX_KM,
+    ReverseGeocoder,
+    bundled_country_names,
+    load_geocoder,
+    normalize_country,
+)
+from reviews import join_reviews, load_id_map, load_review_stats, remap_ids, unmatched_ids, warn_unmatched
 
 OVERPASS_URL = "https://overpass-api.de/api/interpreter"
 
@@ -28,6 +47,23 @@ CUISINE_MAP = [
     ("himalayan", "Himalayan"),
 ]
 
+# token -> (precedence, label); lower precedence wins when a tag lists several cuisines
+CUISINE_LOOKUP = {key: (rank, mapped) for rank, (key, mapped) in enumerate(CUISINE_MAP)}
+
+NEPALI_SPEAKING_CUISINES = {"Nepali", "Himalayan", "Indo-Nepali"}
+HINDI_SPEAKING_CUISINES = {"Indian", "North Indian", "South Indian", "Indo-Nepali"}
+
+ADDRESS_KEYS = (
+    "addr:housenumber",
+    "addr:street",
+    "addr:suburb",
+    "addr:city",
+    "addr:state",
+    "addr:postcode",
+    "addr:country",
+)
+CITY_KEYS = ("addr:city", "addr:town", "addr:village", "addr:suburb", "addr:hamlet")
+
 DEFAULT_COVER = "https://images.unsplash.com/photo-1540189549336-e6e99c3679fe"
 
 
@@ -43,6 +79,16 @@ def normalize_cuisine(tag_value: str) -> Optional[str]:
     return None
 
 
+@functools.lru_cache(maxsize=None)
+def cached_cuisine(tag_value: str) -> Optional[str]:
+    """normalize_cuisine via the token lookup table; many elements share a tag value."""
+    if not tag_value:
+        return None
+    parts = re.split(r"[;,]", tag_value.lower().replace(" ", "_"))
+    best = min((CUISINE_LOOKUP[p.strip()] for p in parts if p.strip() in CUISINE_LOOKUP), default=None)
+    return best[1] if best else None
+
+
 def build_address(tags: dict) -> str:
     addr_full = tags.get("addr:full")
     if addr_full:
@@ -69,8 +115,8 @@ def guess_city(tags: dict) -> Optional[str]:
     )
 
 
-def guess_country(tags: dict) -> Optional[str]:
-    return tags.get("addr:country") or tags.get("country")
+def guess_country(tags: dict, country_names: Optional[dict] = None) -> Optional[str]:
+    return normalize_country(tags.get("addr:country") or tags.get("country"), country_names)
 
 
 def overpass_query(countries: list[str], bboxes: list[str]) -> str:
@@ -93,6 +139,7 @@ def overpass_query(countries: list[str], bboxes: list[str]) -> str:
     return f"[out:json][timeout:180];{query_body}out center tags;"
 
 
+@profiling.profiled(items=lambda data, query: len(data.get("elements", [])))
 def fetch_overpass(query: str) -> dict:
     data = urllib.parse.urlencode({"data": query}).encode("utf-8")
     req = urllib.request.Request(OVERPASS_URL, data=data, method="POST")
@@ -169,18 +216,153 @@ def to_restaurant(el: dict) -> Optional[dict]:
     }
 
 
-def build_dataset(elements: list[dict]) -> list[dict]:
-    restaurants = []
-    seen = set()
+@functools.lru_cache(maxsize=None)
+def restaurant_template(cuisine: str, today: str) -> dict:
+    """Shared defaults for every record of one cuisine, in output key order."""
+    return {
+        "id": None,
+        "name": None,
+        "japanese_name": None,
+        "cuisineType": cuisine,
+        "priceRange": "¥¥",
+        "country": None,
+        "city": None,
+        "latitude": None,
+        "longitude": None,
+        "address": None,
+        "address_japanese": None,
+        "phone": None,
+        "website": None,
+        "google_maps_url": None,
+        "rating": 4.0,
+        "review_count": 0,
+        "description": f"Authentic {cuisine} cuisine.",
+        "description_japanese": None,
+        "images": None,
+        "cover_image": DEFAULT_COVER,
+        "operating_hours": None,
+        "features": None,
+        "specialties": None,
+        "menu_highlights": None,
+        "price_range_details": None,
+        "is_halal": False,
+        "is_vegetarian": False,
+        "has_vegan_options": False,
+        "has_english_menu": True,
+        "has_nepali_speaking_staff": cuisine in NEPALI_SPEAKING_CUISINES,
+        "has_hindi_speaking_staff": cuisine in HINDI_SPEAKING_CUISINES,
+        "accepts_credit_card": True,
+        "nearest_station": "",
+        "walking_minutes": 0,
+        "last_updated": today,
+    }
+
+
+def build_records(elements: Iterable[dict], geocoder: Optional[ReverseGeocoder] = None) -> list[Tuple[str, dict]]:
+    """
+    Bulk equivalent of to_restaurant over many elements.
+
+    Returns (element type, record) pairs for the elements that convert. With a
+    geocoder, elements lacking city/country tags are kept and resolved from
+    their coordinates in one pass instead of being dropped. Records
+    are copied from per-cuisine templates instead of being built key by key,
+    and cuisine tags are normalized once per distinct value. The cyclic GC is
+    paused meanwhile: it would otherwise rescan every new record repeatedly.
+    """
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _build_records(elements, geocoder)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _build_records(elements: Iterable[dict], geocoder: Optional[ReverseGeocoder]) -> list[Tuple[str, dict]]:
+    today = dt.date.today().isoformat()
+    out = []
+    unresolved = []
+    # ISO codes resolve against the geocoder's own CSV so tagged and geocoded records agree.
+    country_names = geocoder.country_names if geocoder is not None else bundled_country_names()
     for el in elements:
-        r = to_restaurant(el)
-        if not r:
+        tags = el.get("tags") or {}
+        name = tags.get("name")
+        if not name:
+            continue
+
+        cuisine = cached_cuisine(tags.get("cuisine", ""))
+        if not cuisine:
+            continue
+
+        if el.get("type") == "node":
+            lat, lon = el.get("lat"), el.get("lon")
+        else:
+            center = el.get("center") or {}
+            lat, lon = center.get("lat"), center.get("lon")
+        city = next(filter(None, map(tags.get, CITY_KEYS)), None)
+        country = normalize_country(tags.get("addr:country") or tags.get("country"), country_names)
+        if lat is None or lon is None:
+            continue
+        needs_geocoding = not city or not country
+        if needs_geocoding and geocoder is None:
             continue
+
+        address = tags.get("addr:full") or ", ".join(filter(None, map(tags.get, ADDRESS_KEYS)))
+        if not address and not needs_geocoding:
+            continue
+
+        record = restaurant_template(cuisine, today).copy()
+        record.update(
+            id=f"osm-{el.get('id')}",
+            name=name,
+            country=country,
+            city=city,
+            latitude=lat,
+            longitude=lon,
+            address=address,
+            phone=tags.get("phone"),
+            website=tags.get("website"),
+            google_maps_url=f"https://maps.google.com/?q={lat},{lon}",
+            images=[],
+            features=[],
+            specialties=[],
+        )
+        if needs_geocoding:
+            unresolved.append(record)
+        out.append((el.get("type", "node"), record))
+
+    if not unresolved:
+        return out
+    geocoder.fill_missing(unresolved)
+    for record in unresolved:
+        if record["city"] and record["country"] and not record["address"]:
+            record["address"] = f"{record['city']}, {record['country']}"
+    return [(source, r) for source, r in out if r["city"] and r["country"]]
+
+
+def load_curated(path: str) -> list[dict]:
+    """Hand-maintained (non-OSM) restaurants from an existing dataset file."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return [r for r in data.get("restaurants", []) if record_source(r) == "curated"]
+
+
+@profiling.profiled(items=lambda restaurants, elements, *args, **kwargs: len(elements))
+def build_dataset(
+    elements: list[dict],
+    curated: Optional[list[dict]] = None,
+    dedup_radius_m: float = DEFAULT_RADIUS_M,
+    precedence: Sequence[str] = DEFAULT_PRECEDENCE,
+    geocoder: Optional[ReverseGeocoder] = None,
+) -> list[dict]:
+    candidates = [("curated", r) for r in curated or []]
+    seen = {r["id"] for r in curated or []}
+    for source, r in build_records(elements, geocoder=geocoder):
         if r["id"] in seen:
             continue
         seen.add(r["id"])
-        restaurants.append(r)
-    return restaurants
+        candidates.append((source, r))
+    return dedupe_restaurants(candidates, radius_m=dedup_radius_m, precedence=precedence)
 
 
 def main() -> int:
@@ -188,11 +370,62 @@ def main() -> int:
     parser.add_argument("--country", action="append", default=[], help="Country name (e.g., Japan)")
     parser.add_argument("--bbox", action="append", default=[], help="minLat,minLon,maxLat,maxLon")
     parser.add_argument("--out", required=True, help="Output JSON path")
+    parser.add_argument("--curated", default=None, help="Existing dataset whose non-OSM entries are merged in")
+    parser.add_argument(
+        "--dedup-radius",
+        type=float,
+        default=DEFAULT_RADIUS_M,
+        help=f"Merge similarly named restaurants within N meters (default {DEFAULT_RADIUS_M:g}, 0 disables)",
+    )
+    parser.add_argument(
+        "--prefer",
+        default=",".join(DEFAULT_PRECEDENCE),
+        help=f"Duplicate precedence, first wins (default {','.join(DEFAULT_PRECEDENCE)})",
+    )
+    parser.add_argument(
+        "--geocode",
+        nargs="?",
+        const=DEFAULT_CITIES_PATH,
+        default=None,
+        metavar="CITIES_CSV",
+        help="Fill missing city/country from coordinates (default file: geodata/cities.csv)",
+    )
+    parser.add_argument(
+        "--geocode-max-km",
+        type=float,
+        default=DEFAULT_MAX_KM,
+        help=f"Max distance to the nearest city centroid (default {DEFAULT_MAX_KM:g})",
+    )
+    parser.add_argument("--reviews", default=None, help="reviews.json whose aggregates are joined into the output")
+    parser.add_argument("--id-map", default=None, help="JSON object mapping review restaurant_ids to dataset ids")
+    parser.add_argument("--strict", action="store_true", help="Fail when reviewed ids match no restaurant")
+    profiling.add_arguments(parser)
     args = parser.parse_args()
+    profiling.configure(args, "build_osm")
+
+    curated = load_curated(args.curated) if args.curated else []
+    geocoder = load_geocoder(args.geocode, args.geocode_max_km) if args.geocode else None
+    precedence = [p.strip() for p in args.prefer.split(",") if p.strip()]
 
     query = overpass_query(args.country, args.bbox)
     data = fetch_overpass(query)
-    restaurants = build_dataset(data.get("elements", []))
+    restaurants = build_dataset(
+        data.get("elements", []),
+        curated=curated,
+        dedup_radius_m=args.dedup_radius,
+        precedence=precedence,
+        geocoder=geocoder,
+    )
+    if args.reviews:
+        stats = load_review_stats(args.reviews)
+        if args.id_map:
+            stats = remap_ids(stats, load_id_map(args.id_map))
+        unmatched = unmatched_ids(restaurants, stats)
+        warn_unmatched(unmatched, len(stats))
+        if unmatched and args.strict:
+            print("❌ Unmatched review ids (use --id-map or fix reviews.json)", file=sys.stderr)
+            return 1
+        join_reviews(restaurants, stats)
 
     payload = {
         "version": "2.0.0",
@@ -201,10 +434,10 @@ def main() -> int:
         "restaurants": restaurants,
     }
 
-    with open(args.out, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
-
-    print(f"Wrote {len(restaurants)} restaurants to {args.out}")
+    if write_json(args.out, payload):
+        print(f"Wrote {len(restaurants)} restaurants to {args.out}")
+    else:
+        print(f"Unchanged: {len(restaurants)} restaurants in {args.out}")
     return 0
 
 
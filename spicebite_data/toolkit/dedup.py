@@ -0,0 +1,108 @@
+"""
+Spatial near-duplicate detection for SpiceBite restaurant records.
+
+The same restaurant is often mapped in OSM as both a node and a way, or is
+already present as a curated entry. Candidates are bucketed into a SpatialGrid
+and only neighbors within the radius are compared by normalized name, so the
+pass stays near-linear instead of comparing every pair of records.
+"""
+
+import difflib
+import re
+import unicodedata
+from typing import Iterable, Optional, Sequence, Tuple
+
+from spatial import SpatialGrid
+
+# Sources in order of preference: the first one wins when records collide.
+DEFAULT_PRECEDENCE = ("curated", "node", "way", "relation")
+DEFAULT_RADIUS_M = 75.0
+DEFAULT_MIN_SIMILARITY = 0.85
+
+NAME_STOPWORDS = {"the", "and", "restaurant", "restaurants", "cafe", "kitchen", "dining"}
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, strip accents/punctuation and generic words from a restaurant name."""
+    text = unicodedata.normalize("NFKD", name or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    tokens = re.sub(r"[^\w]+", " ", text).split()
+    kept = [t for t in tokens if t not in NAME_STOPWORDS]
+    return " ".join(kept or tokens)
+
+
+def name_similarity(a: str, b: str) -> float:
+    """
+    Similarity in [0, 1] between two normalized names.
+
+    A name whose words are all contained in the other ("everest" in "everest
+    momo") scores by length ratio, so a short shared word such as "himalaya"
+    does not make "himalaya" and "himalaya curry house" the same place.
+    """
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    score = difflib.SequenceMatcher(None, a, b).ratio()
+    shorter, longer = sorted((a, b), key=len)
+    if set(shorter.split()) <= set(longer.split()):
+        score = max(score, len(shorter) / len(longer))
+    return score
+
+
+def record_source(record: dict) -> str:
+    """Best-effort source of a record that was not tagged by the caller."""
+    return "node" if str(record.get("id", "")).startswith("osm-") else "curated"
+
+
+def merge_into(winner: dict, loser: dict) -> None:
+    """Fill empty fields of the winning record from its duplicate."""
+    for key, value in loser.items():
+        if key == "id" or value in (None, "", [], {}):
+            continue
+        if winner.get(key) in (None, "", [], {}):
+            winner[key] = value
+
+
+def dedupe_restaurants(
+    candidates: Iterable[Tuple[str, dict]],
+    radius_m: float = DEFAULT_RADIUS_M,
+    min_similarity: float = DEFAULT_MIN_SIMILARITY,
+    precedence: Sequence[str] = DEFAULT_PRECEDENCE,
+) -> list[dict]:
+    """
+    Merge (source, record) candidates that are within radius_m of each other
+    and have similar names. The record whose source ranks first in precedence
+    is kept; the others only contribute fields it is missing. Output keeps the
+    input order of the kept records.
+    """
+    rank = {source: i for i, source in enumerate(precedence)}
+    ordered = sorted(
+        enumerate(candidates),
+        key=lambda pair: (rank.get(pair[1][0], len(rank)), pair[0]),
+    )
+
+    grid = SpatialGrid(max(radius_m, 1.0))
+    kept: list[Tuple[int, dict]] = []
+    for index, (_source, record) in ordered:
+        lat, lon = record.get("latitude"), record.get("longitude")
+        if lat is None or lon is None or radius_m <= 0:
+            kept.append((index, record))
+            continue
+
+        key = normalize_name(record.get("name", ""))
+        match: Optional[dict] = None
+        best = min_similarity
+        for _dist, (other_key, other) in grid.within(lat, lon, radius_m):
+            score = name_similarity(key, other_key)
+            if score >= best:
+                match, best = other, score
+
+        if match is not None:
+            merge_into(match, record)
+            continue
+        grid.insert(lat, lon, (key, record))
+        kept.append((index, record))
+
+    kept.sort(key=lambda pair: pair[0])
+    return [record for _index, record in kept]
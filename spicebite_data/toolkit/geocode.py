@@ -0,0 +1,112 @@
+"""
+Offline reverse geocoding for OSM elements without addr:city / addr:country.
+
+Loads a city-centroid CSV (name,country[,iso],latitude,longitude[,population])
+once, indexes it in a SpatialGrid and assigns each record the nearest city
+within max_km. Works fully offline; geodata/cities.csv is a small bundled file
+that covers the cities in the published dataset. Swap in a larger export (e.g.
+GeoNames cities15000 converted to the same columns) for worldwide pulls.
+
+Countries are always full names, as in the curated dataset. OSM's
+addr:country is usually an ISO 3166-1 alpha-2 code ("JP"); normalize_country
+maps codes listed in the iso column to the name ("Japan"). A geocoder carries
+the code map of the CSV it was loaded from (country_names), so tagged and
+geocoded records agree whichever file is used; without one, the bundled
+file's codes apply.
+"""
+
+import csv
+import functools
+import os
+from typing import Iterable, Mapping, Optional, Tuple
+
+from spatial import SpatialGrid
+
+DEFAULT_CITIES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "geodata", "cities.csv")
+DEFAULT_MAX_KM = 50.0
+
+
+class ReverseGeocoder:
+    """Nearest-city lookup over a fixed set of city centroids."""
+
+    def __init__(
+        self,
+        cities: Iterable[Tuple[str, str, float, float]],
+        max_km: float = DEFAULT_MAX_KM,
+        country_names: Optional[Mapping[str, str]] = None,
+    ):
+        self.country_names = dict(country_names or {})
+        self.max_m = max_km * 1000.0
+        self.grid = SpatialGrid(max(self.max_m, 1.0))
+        for name, country, lat, lon in cities:
+            self.grid.insert(lat, lon, (name, country))
+
+    def __len__(self) -> int:
+        return len(self.grid)
+
+    def lookup(self, lat: float, lon: float) -> Optional[Tuple[str, str]]:
+        """(city, country) of the nearest centroid within max_km, else None."""
+        nearest = min(self.grid.within(lat, lon, self.max_m), key=lambda hit: hit[0], default=None)
+        return nearest[1] if nearest else None
+
+    def fill_missing(self, records: Iterable[dict]) -> int:
+        """Fill empty city/country of records in place; returns how many were resolved."""
+        resolved = 0
+        for record in records:
+            if record.get("city") and record.get("country"):
+                continue
+            lat, lon = record.get("latitude"), record.get("longitude")
+            if lat is None or lon is None:
+                continue
+            hit = self.lookup(lat, lon)
+            if not hit:
+                continue
+            city, country = hit
+            record["city"] = record.get("city") or city
+            record["country"] = record.get("country") or country
+            resolved += 1
+        return resolved
+
+
+def read_country_names(path: str) -> dict[str, str]:
+    """ISO alpha-2 code → country name from the iso column of a cities CSV."""
+    names = {}
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            iso, country = (row.get("iso") or "").strip().upper(), (row.get("country") or "").strip()
+            if iso and country:
+                names.setdefault(iso, country)
+    return names
+
+
+def normalize_country(value: Optional[str], country_names: Optional[Mapping[str, str]] = None) -> Optional[str]:
+    """Country name for an ISO code in country_names (default: the bundled CSV's); other values are returned stripped."""
+    if not value:
+        return value
+    value = value.strip()
+    if len(value) != 2:
+        return value
+    names = bundled_country_names() if country_names is None else country_names
+    return names.get(value.upper(), value)
+
+
+@functools.lru_cache(maxsize=None)
+def bundled_country_names() -> dict[str, str]:
+    return read_country_names(DEFAULT_CITIES_PATH)
+
+
+def read_cities(path: str) -> list[Tuple[str, str, float, float]]:
+    cities = []
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            try:
+                cities.append((row["name"], row["country"], float(row["latitude"]), float(row["longitude"])))
+            except (KeyError, TypeError, ValueError):
+                continue
+    return cities
+
+
+@functools.lru_cache(maxsize=None)
+def load_geocoder(path: str = DEFAULT_CITIES_PATH, max_km: float = DEFAULT_MAX_KM) -> ReverseGeocoder:
+    """Load and index a centroid file once per process."""
+    return ReverseGeocoder(read_cities(path), max_km=max_km, country_names=read_country_names(path))
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Join reviews.json aggregates into the SpiceBite restaurant dataset.
+
+Reviews are read once into per-restaurant running aggregates (count, mean
+rating, likes-weighted rating, tag frequencies, latest review date), then
+joined into the restaurant records in a single pass, so the app no longer has
+to download every review to compute them.
+
+Reviews are matched on restaurant_id. --id-map takes a JSON object mapping
+review restaurant_ids to dataset ids for reviews written against other ids;
+reviewed ids that still match no restaurant are reported on stderr, and
+--strict turns them into a failure.
+
+Usage examples:
+  python3 reviews.py
+  python3 reviews.py --reviews ../data/reviews.json --restaurants ../data/restaurants_global.json
+  python3 reviews.py --id-map review_ids.json --strict
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".dns_system_language", "lib"))
+from dns_data.writers import write_json
+
+TOOLKIT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_REVIEWS = os.path.join(TOOLKIT_DIR, "..", "data", "reviews.json")
+DEFAULT_RESTAURANTS = os.path.join(TOOLKIT_DIR, "..", "data", "restaurants_global.json")
+DEFAULT_TOP_TAGS = 5
+
+
+@dataclass
+class ReviewStats:
+    count: int = 0
+    rating_sum: float = 0.0
+    weighted_sum: float = 0.0
+    weight_total: float = 0.0
+    latest: str = ""
+    tags: Counter = field(default_factory=Counter)
+
+    def add(self, review: dict) -> None:
+        rating = review.get("rating")
+        if not isinstance(rating, (int, float)):
+            return
+        # Each review counts once plus once per "helpful" like.
+        weight = 1 + max(0, review.get("likes") or 0)
+        self.count += 1
+        self.rating_sum += rating
+        self.weighted_sum += rating * weight
+        self.weight_total += weight
+        self.tags.update(review.get("tags") or [])
+        date = review.get("created_at") or review.get("visit_date") or ""
+        if date > self.latest:
+            self.latest = date
+
+    @property
+    def mean(self) -> float:
+        return self.rating_sum / self.count if self.count else 0.0
+
+    @property
+    def weighted(self) -> float:
+        return self.weighted_sum / self.weight_total if self.weight_total else 0.0
+
+
+def aggregate_reviews(reviews: Iterable[dict]) -> dict[str, ReviewStats]:
+    stats: dict[str, ReviewStats] = {}
+    for review in reviews:
+        restaurant_id = review.get("restaurant_id")
+        if not restaurant_id:
+            continue
+        entry = stats.get(restaurant_id)
+        if entry is None:
+            entry = stats[restaurant_id] = ReviewStats()
+        entry.add(review)
+    return stats
+
+
+def load_review_stats(path: str) -> dict[str, ReviewStats]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return aggregate_reviews(data.get("reviews", []))
+
+
+def load_id_map(path: str) -> dict[str, str]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def remap_ids(stats: dict[str, ReviewStats], id_map: dict[str, str]) -> dict[str, ReviewStats]:
+    """Re-key aggregates by dataset id; ids mapped onto the same restaurant are combined."""
+    remapped: dict[str, ReviewStats] = {}
+    for review_id, entry in stats.items():
+        target = id_map.get(review_id, review_id)
+        known = remapped.get(target)
+        if known is None:
+            remapped[target] = entry
+            continue
+        known.count += entry.count
+        known.rating_sum += entry.rating_sum
+        known.weighted_sum += entry.weighted_sum
+        known.weight_total += entry.weight_total
+        known.tags.update(entry.tags)
+        known.latest = max(known.latest, entry.latest)
+    return remapped
+
+
+def unmatched_ids(restaurants: list[dict], stats: dict[str, ReviewStats]) -> list[str]:
+    """Reviewed restaurant ids with no record in the dataset."""
+    ids = {restaurant.get("id") for restaurant in restaurants}
+    return sorted(review_id for review_id in stats if review_id not in ids)
+
+
+def warn_unmatched(unmatched: list[str], total: int) -> None:
+    if unmatched:
+        shown = ", ".join(unmatched[:10]) + (", ..." if len(unmatched) > 10 else "")
+        print(f"⚠️  {len(unmatched)} of {total} reviewed restaurant ids match no restaurant: {shown}", file=sys.stderr)
+
+
+def join_reviews(restaurants: list[dict], stats: dict[str, ReviewStats], top_tags: int = DEFAULT_TOP_TAGS) -> int:
+    """Write aggregates into matching restaurant records; returns how many matched."""
+    joined = 0
+    for restaurant in restaurants:
+        entry = stats.get(restaurant.get("id"))
+        if entry is None or not entry.count:
+            continue
+        restaurant["rating"] = round(entry.mean, 1)
+        restaurant["review_count"] = entry.count
+        summary = {
+            "weighted_rating": round(entry.weighted, 2),
+            "top_tags": [tag for tag, _n in entry.tags.most_common(top_tags)],
+        }
+        if entry.latest:
+            summary["latest_review_date"] = entry.latest
+        restaurant["review_summary"] = summary
+        joined += 1
+    return joined
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Join review aggregates into restaurants")
+    parser.add_argument("--reviews", default=DEFAULT_REVIEWS, help="reviews.json path")
+    parser.add_argument("--restaurants", default=DEFAULT_RESTAURANTS, help="Restaurant dataset path")
+    parser.add_argument("--out", default=None, help="Output path (default: overwrite --restaurants)")
+    parser.add_argument("--top-tags", type=int, default=DEFAULT_TOP_TAGS, help="Tags kept per restaurant")
+    parser.add_argument("--id-map", default=None, help="JSON object mapping review restaurant_ids to dataset ids")
+    parser.add_argument("--strict", action="store_true", help="Fail when reviewed ids match no restaurant")
+    args = parser.parse_args()
+
+    stats = load_review_stats(args.reviews)
+    if args.id_map:
+        stats = remap_ids(stats, load_id_map(args.id_map))
+    with open(args.restaurants, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    restaurants = payload.get("restaurants", [])
+    unmatched = unmatched_ids(restaurants, stats)
+    warn_unmatched(unmatched, len(stats))
+    if unmatched and args.strict:
+        print("❌ Unmatched review ids (use --id-map or fix reviews.json)", file=sys.stderr)
+        return 1
+    joined = join_reviews(restaurants, stats, top_tags=args.top_tags)
+
+    out = args.out or args.restaurants
+    if not write_json(out, payload):
+        print(f"{out} unchanged")
+    print(f"Joined reviews for {joined} of {len(stats)} reviewed restaurants into {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,70 @@
+"""
+Spatial helpers shared by the SpiceBite toolkit.
+
+SpatialGrid buckets points into fixed-size lat/lon cells so that neighbor
+lookups only touch the cells around a query point instead of every record.
+Columns wrap at the antimeridian, so points at 179.9° and -179.9° are
+neighbors.
+"""
+
+import math
+from typing import Any, Iterator, Tuple
+
+EARTH_RADIUS_M = 6_371_000.0
+METERS_PER_DEGREE_LAT = 111_320.0
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in meters."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+class SpatialGrid:
+    """Uniform lat/lon grid of items, queried by radius in meters."""
+
+    def __init__(self, cell_m: float):
+        if cell_m <= 0:
+            raise ValueError("cell_m must be positive")
+        self.cell_deg = cell_m / METERS_PER_DEGREE_LAT
+        # Columns evenly divide 360° (each at least cell_deg wide) so the index wraps cleanly.
+        self.columns = max(1, int(360.0 // self.cell_deg))
+        self.col_deg = 360.0 / self.columns
+        self.cells: dict[Tuple[int, int], list[Tuple[float, float, Any]]] = {}
+
+    def _key(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_deg), math.floor((lon + 180.0) / self.col_deg) % self.columns
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self.cells.values())
+
+    def insert(self, lat: float, lon: float, item: Any) -> None:
+        self.cells.setdefault(self._key(lat, lon), []).append((lat, lon, item))
+
+    def candidates(self, lat: float, lon: float, radius_m: float) -> Iterator[Tuple[float, float, Any]]:
+        """Yield items in the cells that can hold points within radius_m (unfiltered)."""
+        row, col = self._key(lat, lon)
+        lat_span = radius_m / METERS_PER_DEGREE_LAT
+        # Longitude degrees shrink towards the poles, so widen the column span there.
+        max_lat = min(89.9, abs(lat) + lat_span)
+        lon_span = lat_span / math.cos(math.radians(max_lat))
+        drow = math.ceil(lat_span / self.cell_deg)
+        dcol = math.ceil(lon_span / self.col_deg)
+        if 2 * dcol + 1 >= self.columns:
+            cols = range(self.columns)
+        else:
+            cols = [c % self.columns for c in range(col - dcol, col + dcol + 1)]
+        for r in range(row - drow, row + drow + 1):
+            for c in cols:
+                yield from self.cells.get((r, c), ())
+
+    def within(self, lat: float, lon: float, radius_m: float) -> Iterator[Tuple[float, Any]]:
+        """Yield (distance_m, item) for items within radius_m of the point."""
+        for ilat, ilon, item in self.candidates(lat, lon, radius_m):
+            d = haversine_m(lat, lon, ilat, ilon)
+            if d <= radius_m:
+                yield d, item
@@ -8,6 +8,7 @@ SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 DATA_DIR="$SCRIPT_DIR/../data"
 MANIFEST="$SCRIPT_DIR/../manifest.json"
 SCHEMA="$SCRIPT_DIR/../data_schema.json"
+DNS_LIB="$SCRIPT_DIR/../../.dns_system_language/lib"
 
 # Colors
 RED='\033[0;31m'
@@ -78,21 +79,26 @@ version() {
     echo -e "${YELLOW}📝 Updating version to $new_version...${NC}"
     
     # Update manifest version
-    python3 -c "
-import json
-with open('$MANIFEST', 'r') as f:
-    manifest = json.load(f)
+    PYTHONPATH="$DNS_LIB${PYTHONPATH:+:$PYTHONPATH}" python3 -c "
+from dns_data.jsonio import load_json
+from dns_data.writers import write_json
+manifest = load_json('$MANIFEST', memo=False)
 manifest['version'] = '$new_version'
 manifest['last_updated'] = '$(date +%Y-%m-%d)'
 for key in manifest['files']:
     manifest['files'][key]['version'] = '$new_version'
-with open('$MANIFEST', 'w') as f:
-    json.dump(manifest, f, indent=2)
-print('✅ Manifest updated')
+print('✅ Manifest updated' if write_json('$MANIFEST', manifest, newline=True) else '✅ Manifest already up to date')
 "
     echo -e "${GREEN}✅ Version updated to $new_version${NC}"
 }
 
+# Build facet indexes (data/index/*.facets.json) referenced from the manifest
+index() {
+    echo -e "${YELLOW}🗂️  Building facet indexes...${NC}"
+    PYTHONPATH="$DNS_LIB${PYTHONPATH:+:$PYTHONPATH}" python3 -m dns_data.facets "$SCRIPT_DIR/.."
+    echo -e "${GREEN}✅ Facet indexes built${NC}"
+}
+
 # Git commit changes
 commit() {
     local message="${1:-Update DineMate data}"
@@ -119,6 +125,8 @@ full() {
     echo ""
     count
     echo ""
+    index
+    echo ""
     
     if [ "$1" == "--push" ]; then
         commit "Update restaurant data"
@@ -141,6 +149,8 @@ help() {
     echo "  commit \"msg\" - Git commit changes"
     echo "  push         - Push to GitHub"
     echo "  build_osm --country X | --bbox a,b,c,d - Build OSM dataset"
+    echo "  reviews      - Join review aggregates into restaurants"
+    echo "  index        - Build facet indexes listed in manifest"
     echo "  full [--push] - Run full pipeline"
     echo "  help         - Show this help"
     echo ""
@@ -159,6 +169,8 @@ case "${1:-help}" in
     commit) commit "$2" ;;
     push) push ;;
     build_osm) shift; python3 "$SCRIPT_DIR/build_osm.py" "$@" ;;
+    reviews) shift; python3 "$SCRIPT_DIR/reviews.py" "$@" ;;
+    index) index ;;
     full) full "$2" ;;
     help|*) help ;;
 esac
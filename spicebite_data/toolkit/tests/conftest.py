@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Toolkit modules import each other as siblings (they run as scripts).
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
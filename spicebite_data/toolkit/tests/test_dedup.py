@@ -0,0 +1,49 @@
+from dedup import dedupe_restaurants, name_similarity, normalize_name
+
+# About 9 m north of BASE at this latitude.
+BASE = (35.6895, 139.6917)
+NEAR = (35.68958, 139.6917)
+FAR = (35.7000, 139.6917)
+
+
+def restaurant(id, name, lat_lon, **fields):
+    return {"id": id, "name": name, "latitude": lat_lon[0], "longitude": lat_lon[1], **fields}
+
+
+def test_node_and_way_of_same_place_merge_into_node():
+    node = restaurant("osm-node-1", "Everest Restaurant", BASE, phone="")
+    way = restaurant("osm-way-2", "Everest", NEAR, phone="+81 3 0000 0000", website="https://everest.example")
+
+    kept = dedupe_restaurants([("way", way), ("node", node)])
+
+    assert kept == [node]
+    assert node["phone"] == "+81 3 0000 0000"
+    assert node["website"] == "https://everest.example"
+
+
+def test_curated_entry_wins_over_osm_and_keeps_its_fields():
+    curated = restaurant("global-001", "Namaste Kitchen", BASE, rating=4.6)
+    node = restaurant("osm-node-3", "Namaste", NEAR, rating=0, cuisine="Nepali")
+
+    kept = dedupe_restaurants([("node", node), ("curated", curated)])
+
+    assert kept == [curated]
+    assert curated["rating"] == 4.6
+    assert curated["cuisine"] == "Nepali"
+
+
+def test_restaurants_sharing_a_word_are_not_merged():
+    kitchen = restaurant("osm-node-4", "Himalaya Kitchen", BASE)
+    curry_house = restaurant("osm-node-5", "Himalaya Curry House", NEAR)
+
+    kept = dedupe_restaurants([("node", kitchen), ("node", curry_house)])
+
+    assert kept == [kitchen, curry_house]
+    assert name_similarity(normalize_name("Himalaya Kitchen"), normalize_name("Himalaya Curry House")) < 0.85
+
+
+def test_same_name_outside_radius_is_kept():
+    a = restaurant("osm-node-6", "Everest", BASE)
+    b = restaurant("osm-node-7", "Everest", FAR)
+
+    assert dedupe_restaurants([("node", a), ("node", b)]) == [a, b]
@@ -0,0 +1,95 @@
+from build_osm import build_records
+from geocode import DEFAULT_CITIES_PATH, ReverseGeocoder, load_geocoder, normalize_country, read_cities
+
+SHINJUKU = (35.6938, 139.7034)
+PACIFIC = (30.0, 160.0)
+
+
+def element(id, lat_lon, type="node", **tags):
+    tags.setdefault("name", "Everest Dining")
+    tags.setdefault("cuisine", "nepali")
+    el = {"type": type, "id": id, "tags": tags}
+    if type == "node":
+        el.update(lat=lat_lon[0], lon=lat_lon[1])
+    else:
+        el["center"] = {"lat": lat_lon[0], "lon": lat_lon[1]}
+    return el
+
+
+def test_lookup_returns_nearest_city_within_range():
+    geocoder = load_geocoder(DEFAULT_CITIES_PATH)
+
+    assert geocoder.lookup(*SHINJUKU) == ("Tokyo", "Japan")
+    assert geocoder.lookup(27.70, 85.30) == ("Kathmandu", "Nepal")
+    assert geocoder.lookup(*PACIFIC) is None
+
+
+def test_max_km_limits_matches():
+    geocoder = ReverseGeocoder(read_cities(DEFAULT_CITIES_PATH), max_km=1)
+
+    assert geocoder.lookup(*SHINJUKU) is None
+
+
+def test_fill_missing_only_fills_empty_fields():
+    geocoder = load_geocoder(DEFAULT_CITIES_PATH)
+    tagged = {"latitude": SHINJUKU[0], "longitude": SHINJUKU[1], "city": "Shinjuku", "country": ""}
+    far = {"latitude": PACIFIC[0], "longitude": PACIFIC[1], "city": None, "country": None}
+
+    assert geocoder.fill_missing([tagged, far]) == 1
+    assert tagged["city"] == "Shinjuku"
+    assert tagged["country"] == "Japan"
+    assert far["city"] is None
+
+
+def test_normalize_country_maps_iso_codes_to_names():
+    assert normalize_country("JP") == "Japan"
+    assert normalize_country("gb") == "United Kingdom"
+    assert normalize_country("Japan") == "Japan"
+    assert normalize_country("XX") == "XX"
+    assert normalize_country(None) is None
+
+
+def test_build_records_geocodes_untagged_elements():
+    elements = [
+        element(1, SHINJUKU),
+        element(2, SHINJUKU, type="way", **{"addr:city": "Shinjuku", "addr:country": "JP", "addr:street": "Okubo"}),
+        element(3, PACIFIC),
+    ]
+
+    without = [r["id"] for _source, r in build_records(elements)]
+    records = {r["id"]: (source, r) for source, r in build_records(elements, geocoder=load_geocoder(DEFAULT_CITIES_PATH))}
+
+    assert without == ["osm-2"]
+    assert set(records) == {"osm-1", "osm-2"}
+    source, geocoded = records["osm-1"]
+    assert source == "node"
+    assert (geocoded["city"], geocoded["country"], geocoded["address"]) == ("Tokyo", "Japan", "Tokyo, Japan")
+    source, tagged = records["osm-2"]
+    assert source == "way"
+    assert (tagged["city"], tagged["country"]) == ("Shinjuku", "Japan")
+
+
+def test_zero_max_km_only_matches_exact_centroids():
+    geocoder = ReverseGeocoder([("Tokyo", "Japan", *SHINJUKU)], max_km=0)
+
+    assert geocoder.lookup(*SHINJUKU) == ("Tokyo", "Japan")
+    assert geocoder.lookup(35.70, 139.70) is None
+
+
+def test_build_records_maps_iso_codes_with_the_loaded_csv(tmp_path):
+    cities = tmp_path / "cities.csv"
+    cities.write_text("name,country,iso,latitude,longitude,population\nDhaka,Bangladesh,BD,23.8103,90.4125,8906039\n")
+    geocoder = load_geocoder(str(cities))
+    dhaka = (23.79, 90.41)
+
+    records = build_records(
+        [
+            element(1, dhaka),
+            element(2, dhaka, **{"addr:city": "Dhaka", "addr:country": "BD", "addr:street": "Road 11"}),
+        ],
+        geocoder=geocoder,
+    )
+
+    assert [r["country"] for _source, r in records] == ["Bangladesh", "Bangladesh"]
+    assert normalize_country("BD", geocoder.country_names) == "Bangladesh"
+    assert normalize_country("JP", geocoder.country_names) == "JP"
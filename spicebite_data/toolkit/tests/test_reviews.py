@@ -0,0 +1,82 @@
+import json
+import sys
+
+from reviews import aggregate_reviews, join_reviews, remap_ids, unmatched_ids
+
+REVIEWS = [
+    {"restaurant_id": "rest-001", "rating": 5, "likes": 3, "tags": ["momo", "authentic"], "created_at": "2024-11-20"},
+    {"restaurant_id": "rest-001", "rating": 3, "likes": 0, "tags": ["momo"], "created_at": "2024-12-01"},
+    {"restaurant_id": "rest-002", "rating": 4, "tags": []},
+]
+
+
+def test_join_writes_aggregates_for_matching_ids():
+    restaurants = [{"id": "rest-001"}, {"id": "global-001"}]
+
+    assert join_reviews(restaurants, aggregate_reviews(REVIEWS)) == 1
+    assert restaurants[0]["rating"] == 4.0
+    assert restaurants[0]["review_count"] == 2
+    assert restaurants[0]["review_summary"] == {
+        "weighted_rating": 4.6,
+        "top_tags": ["momo", "authentic"],
+        "latest_review_date": "2024-12-01",
+    }
+    assert "review_summary" not in restaurants[1]
+
+
+def test_summary_omits_missing_review_date():
+    restaurants = [{"id": "rest-002"}]
+
+    join_reviews(restaurants, aggregate_reviews(REVIEWS))
+
+    assert "latest_review_date" not in restaurants[0]["review_summary"]
+
+
+def test_unmatched_ids_and_id_map():
+    stats = aggregate_reviews(REVIEWS)
+    restaurants = [{"id": "global-004"}]
+
+    assert unmatched_ids(restaurants, stats) == ["rest-001", "rest-002"]
+
+    remapped = remap_ids(stats, {"rest-001": "global-004", "rest-002": "global-004"})
+    assert unmatched_ids(restaurants, remapped) == []
+    assert join_reviews(restaurants, remapped) == 1
+    assert restaurants[0]["review_count"] == 3
+
+
+def run_build_osm_strict(monkeypatch, tmp_path, id_map=None):
+    import build_osm
+
+    element = {
+        "type": "node",
+        "id": 1,
+        "lat": 35.69,
+        "lon": 139.70,
+        "tags": {"name": "Everest Dining", "cuisine": "nepali", "addr:city": "Tokyo", "addr:country": "JP", "addr:street": "1-2-3"},
+    }
+    reviews = tmp_path / "reviews.json"
+    reviews.write_text(json.dumps({"reviews": REVIEWS}))
+    out = tmp_path / "out.json"
+    monkeypatch.setattr(build_osm, "fetch_overpass", lambda query: {"elements": [element]})
+    argv = ["build_osm.py", "--bbox", "35,139,36,140", "--out", str(out), "--reviews", str(reviews), "--strict"]
+    if id_map is not None:
+        ids = tmp_path / "ids.json"
+        ids.write_text(json.dumps(id_map))
+        argv += ["--id-map", str(ids)]
+    monkeypatch.setattr(sys, "argv", argv)
+    return build_osm.main(), out
+
+
+def test_build_osm_reviews_strict_fails_on_unmatched_ids(monkeypatch, tmp_path):
+    status, out = run_build_osm_strict(monkeypatch, tmp_path)
+
+    assert status == 1
+    assert not out.exists()
+
+
+def test_build_osm_reviews_joins_through_id_map(monkeypatch, tmp_path):
+    status, out = run_build_osm_strict(monkeypatch, tmp_path, id_map={"rest-001": "osm-1", "rest-002": "osm-1"})
+
+    assert status == 0
+    [restaurant] = json.loads(out.read_text())["restaurants"]
+    assert restaurant["review_count"] == 3
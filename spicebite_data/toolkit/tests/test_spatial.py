@@ -0,0 +1,22 @@
+from spatial import SpatialGrid, haversine_m
+
+
+def test_within_wraps_at_antimeridian():
+    grid = SpatialGrid(50_000)
+    grid.insert(-17.0, -179.9, "east")
+    grid.insert(-17.0, 179.0, "west")
+
+    hits = dict((item, d) for d, item in grid.within(-17.0, 179.9, 50_000))
+
+    assert list(hits) == ["east"]
+    assert abs(hits["east"] - haversine_m(-17.0, 179.9, -17.0, -179.9)) < 1e-6
+
+
+def test_wide_radius_yields_each_item_once():
+    grid = SpatialGrid(1_000_000)
+    for lon in range(-180, 180, 30):
+        grid.insert(0.0, float(lon), lon)
+
+    items = [item for _lat, _lon, item in grid.candidates(0.0, 0.0, 20_000_000)]
+
+    assert sorted(items) == list(range(-180, 180, 30))